@@ -0,0 +1,215 @@
+"""
+Benchmarks of the calculation engine (src/calculate_times.py and src/batch_calculate_times.py).
+
+Runs every pipeline stage on synthetic plans and reports time and peak memory per stage:
+
+    python benchmarks/bench_calculate_times.py                 # run and print
+    python benchmarks/bench_calculate_times.py --save          # store the numbers as the new baseline
+    python benchmarks/bench_calculate_times.py --check         # exit 1 if a stage is slower than the baseline
+
+Plans are generated from a fixed seed, so runs on the same machine are comparable. Every
+stage is timed alone on the output of the previous ones, best of 3 runs (5 up to 1000 activities).
+"""
+import gc
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, SRC_DIR)
+
+from calculate_times import CalculateTimes  # noqa: E402
+from batch_calculate_times import BatchCalculateTimes  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [10, 1000, 100000, 1000000]
+
+# Share of activities per duration bracket (minutes), >= 5 h tasks hit split_long_tasks
+DURATION_MIX = [
+    (0.35, 5, 29),
+    (0.30, 30, 119),
+    (0.12, 120, 180),
+    (0.08, 181, 299),
+    (0.15, 300, 720),
+]
+
+
+def synthetic_plan(size, seed=2025):
+    """Returns (list_with_rest, list_without_rest) with size activities in total, like the main window tables."""
+    rng = random.Random(seed)
+    names_path = os.path.join(SRC_DIR, "Files", "Activity Names.txt")
+    with open(names_path, "r", encoding="utf-8") as f:
+        names = [line.strip() for line in f if line.strip()] or ["Activity"]
+
+    weights = [share for share, _, _ in DURATION_MIX]
+    with_rest, without_rest = [], []
+    for _ in range(size):
+        _, low, high = rng.choices(DURATION_MIX, weights)[0]
+        minutes = rng.randint(low, high)
+        row = [rng.choice(names), f"{minutes // 60}:{minutes % 60:02}"]
+        # About a quarter of the activities go to the tables without rest
+        (without_rest if rng.random() < 0.25 else with_rest).append(row)
+    return with_rest, without_rest
+
+
+def dict_engine_stages(with_rest, without_rest):
+    """Stages of CalculateTimes, each a callable taking the output of the previous one."""
+    calc = CalculateTimes(with_rest, without_rest)
+
+    def totals(lists):
+        calc.total_seconds(lists[0]), calc.total_seconds(lists[1])
+        return lists
+
+    return [
+        ("parse", lambda _: (calc.convert_list_to_activities(with_rest), calc.convert_list_to_activities(without_rest))),
+        ("split", lambda lists: (calc.split_long_tasks(lists[0]), lists[1])),
+        ("add_rest", lambda lists: (calc.add_rest_times(lists[0]), calc.add_rest_times(lists[1], has_rest=False))),
+        ("totals", totals),
+        ("format", lambda lists: (calc.convert_activities_to_list(lists[0]), calc.convert_activities_to_list(lists[1]))),
+    ]
+
+
+def array_engine_stages(with_rest, without_rest):
+    """Stages of BatchCalculateTimes."""
+    calc = BatchCalculateTimes(with_rest, without_rest)
+
+    def totals(rows):
+        calc.total_seconds(*rows[0][1:]), calc.total_seconds(*rows[1][1:])
+        return rows
+
+    return [
+        ("parse", lambda _: (calc.convert_list_to_arrays(with_rest), calc.convert_list_to_arrays(without_rest))),
+        ("split", lambda arrays: (calc.split_long_tasks_array(*arrays[0]), arrays[1])),
+        ("add_rest", lambda arrays: tuple((names,) + calc.block_tuples(minutes, has_rest)
+                                          for (names, minutes, _), has_rest in zip(arrays, (True, False)))),
+        ("totals", totals),
+        ("format", lambda rows: tuple(list(calc.convert_arrays_to_list(*r)) for r in rows)),
+    ]
+
+
+ENGINES = {
+    "CalculateTimes": dict_engine_stages,
+    "BatchCalculateTimes": array_engine_stages,
+}
+
+
+def time_stages(stages, repeats):
+    """
+    Times every stage alone: its input is made once by the previous stages, then the stage
+    runs repeats times on it and the best time is kept (the garbage collector is off while
+    a run is timed, like timeit).
+
+    Returns:
+        dict: {stage: seconds}.
+    """
+    results = {}
+    value = None
+    for name, stage in stages:
+        times = []
+        for _ in range(repeats):
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                output = stage(value)
+                times.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+        results[name] = min(times)
+        value = output
+    return results
+
+
+def memory_stages(stages):
+    # Runs the stages in order once; returns {stage: peak bytes}
+    results = {}
+    value = None
+    for name, stage in stages:
+        tracemalloc.start()
+        value = stage(value)
+        results[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return results
+
+
+def benchmark(sizes, engines, measure_memory=True):
+    """Returns {engine: {size: {stage: {"seconds": .., "peak_kib": ..}}}}."""
+    report = {}
+    for size in sizes:
+        plan = synthetic_plan(size)
+        # Best of a few runs at every size, more for small plans where timer noise is large
+        repeats = 5 if size <= 1000 else 3
+        for engine in engines:
+            make_stages = ENGINES[engine]
+            best = time_stages(make_stages(*plan), repeats)
+            memory = memory_stages(make_stages(*plan)) if measure_memory else {}
+            report.setdefault(engine, {})[str(size)] = {
+                stage: {"seconds": round(best[stage], 6),
+                        "peak_kib": round(memory[stage] / 1024, 1) if stage in memory else None}
+                for stage in best
+            }
+            print_size(engine, size, report[engine][str(size)])
+    return report
+
+
+def print_size(engine, size, stages):
+    total = sum(stage["seconds"] for stage in stages.values())
+    parts = "  ".join(f"{name}={stage['seconds'] * 1000:.2f}ms" +
+                      (f"/{stage['peak_kib']:.0f}KiB" if stage["peak_kib"] is not None else "")
+                      for name, stage in stages.items())
+    print(f"{engine:<20} {size:>8}  total={total * 1000:.2f}ms  {parts}")
+
+
+def check(report, baseline, tolerance, min_seconds):
+    """Returns a list of stages slower than the baseline by more than tolerance (stages under min_seconds are ignored)."""
+    regressions = []
+    for engine, sizes in report.items():
+        for size, stages in sizes.items():
+            for stage, numbers in stages.items():
+                base = baseline.get("results", {}).get(engine, {}).get(size, {}).get(stage)
+                if not base or base["seconds"] < min_seconds:
+                    continue
+                if numbers["seconds"] > base["seconds"] * (1 + tolerance):
+                    regressions.append(f"{engine} {size} {stage}: {numbers['seconds'] * 1000:.2f}ms "
+                                       f"(baseline {base['seconds'] * 1000:.2f}ms)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Plan sizes (activities).")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--save", action="store_true", help=f"Write the results to {BASELINE_PATH}.")
+    parser.add_argument("--check", action="store_true", help="Compare with the baseline and fail on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown for --check (0.5 = 50%%).")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Ignore stages faster than this in --check.")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.sizes, args.engines, not args.no_memory)
+
+    if args.save:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"machine": {"python": platform.python_version(), "platform": platform.platform(),
+                                   "processor": platform.processor() or platform.machine()},
+                       "results": report}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+
+    if args.check:
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = check(report, baseline, args.tolerance, args.min_ms / 1000)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Checks fit_plan.fit_durations() against a brute force over every duration of small random plans:
+
+    python benchmarks/check_fit_plan.py              # 300 random cases
+    python benchmarks/check_fit_plan.py --cases 2000
+
+Durations reach LONGEST minutes, so every rest rule and the split of long tasks into
+chunks are covered. The brute force charges the rest that RestRules actually plans
+(planned_minutes), not fit_plan's rest index. Kept activities (Sleep) are mixed in at any
+position, with and without rest; at most two activities are flexible, so every pair of
+durations can be tried at once with numpy. Exits 1 on the first case where the suggestion
+keeps fewer work minutes than the best one or does not fit the budget.
+"""
+import os
+import sys
+import random
+import argparse
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, SRC_DIR)
+
+from rest_rules import RestRules  # noqa: E402
+from fit_plan import rest_cost_index, fit_durations  # noqa: E402
+
+# Past the 5 h split: two 4 h chunks and a remainder in the 3-5 h rule
+LONGEST = 620
+MAX_FLEXIBLE = 2
+
+
+def planned_costs(rules, has_rest):
+    # Minutes a task of each duration 0 .. LONGEST takes in the plan (a dropped task takes none)
+    costs = np.array(rules.planned_table[:LONGEST + 1]) if has_rest else np.arange(LONGEST + 1)
+    costs[0] = 0
+    return costs
+
+
+def brute_force(items, costs, budget):
+    """Most work minutes that fit, trying every duration of every flexible item (None if nothing fits)."""
+    work = np.zeros((), dtype=np.int64)
+    used = np.zeros((), dtype=np.int64)
+    for minutes, has_rest, keep in items:
+        durations = np.arange(minutes, minutes + 1) if keep else np.arange(minutes + 1)
+        # One more axis per item: every combination of durations is in the grid
+        work = work[..., None] + durations
+        used = used[..., None] + costs[has_rest][durations]
+    fits = used <= budget
+    return int(work[fits].max()) if fits.any() else None
+
+
+def random_items(rng):
+    # 1-4 activities, flexible ones beyond MAX_FLEXIBLE are kept
+    items = []
+    flexible = 0
+    for _ in range(rng.randint(1, 4)):
+        keep = rng.random() < 0.3 or flexible == MAX_FLEXIBLE
+        flexible += not keep
+        items.append((rng.randint(1, LONGEST), rng.random() < 0.6, keep))
+    return items
+
+
+def check(cases, seed):
+    rng = random.Random(seed)
+    rules = RestRules()
+    rest = rest_cost_index(rules, LONGEST + 1)
+    costs = {True: planned_costs(rules, True), False: planned_costs(rules, False)}
+    for case in range(cases):
+        items = random_items(rng)
+        # Up to the whole plan, so cases range from nothing fitting to everything fitting
+        budget = rng.randint(10, sum(int(costs[has_rest][minutes]) for minutes, has_rest, _ in items) + 10)
+        expected = brute_force(items, costs, budget)
+        got = fit_durations(items, rest, budget)
+        if got is None or expected is None:
+            ok = got is None and expected is None
+        else:
+            used = sum(int(costs[has_rest][d]) for d, (_, has_rest, _) in zip(got, items))
+            kept = all(d == minutes for d, (minutes, _, keep) in zip(got, items) if keep)
+            ok = sum(got) == expected and used <= budget and kept
+        if not ok:
+            print(f"Case {case}: items={items} budget={budget} got={got} best work={expected}")
+            return False
+    print(f"{cases} cases ok")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check fit_durations() against a brute force.")
+    parser.add_argument("--cases", type=int, default=300, help="Number of random plans (default: 300).")
+    parser.add_argument("--seed", type=int, default=2025, help="Random seed (default: 2025).")
+    args = parser.parse_args(argv)
+    return 0 if check(args.cases, args.seed) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,113 @@
 import os
 from PyQt5.QtCore import Qt
-from create_excel import ExcelTable
+from export_worker import ExportWorker
 from Custom_TableView import CustomView
 from PyQt5.QtGui import QPalette, QColor
-from calculate_times import CalculateTimes
-from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QGroupBox, QTableView, QWidget, QFileDialog
+from calculate_times import CalculateTimes, format_hhmm
+from timeline import Timeline, DEFAULT_DAY_START, anchors_from_rows
+from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QGroupBox, QTableView, QWidget, QFileDialog, QMessageBox
+
+
+def create_group_box(header, font_family, theme):
+    """Create styled group box (Calculation and Week pages)"""
+    group_box = QGroupBox()
+    group_box.setFlat(True)
+    group_box.setTitle(header)
+    group_box.setFont(font_family)
+    group_box.setAlignment(Qt.AlignCenter)
+    group_box.setStyleSheet(f"""
+        QGroupBox {{
+            background-color: {theme['Table']};
+            border: 0px;
+            color: {theme['HeaderText']};
+            border-radius: 6px;
+            margin: 5px;
+        }}
+    """)
+    return group_box
+
+
+def create_page_button(text, theme):
+    """Create styled button (Calculation and Week pages)"""
+    button = QPushButton(text)
+    button.setFixedSize(200, 50)
+    button.setStyleSheet(f"""
+        QPushButton {{
+            background-color: {theme['Header']};
+            color: {theme['Text']};
+            border: 2px solid {theme['Header']};
+            padding: 10px 25px;
+            font-size: 18px;
+            border-radius: 6px;
+            font-weight: bold;
+        }}
+        QPushButton:hover {{
+            background-color: {theme['Hover']};
+            border: 2px solid {theme['Hover']};
+            color: white;
+        }}
+    """)
+    return button
+
+
+class ExportPageMixin:
+    """
+    Export Excel / OK buttons and the background export of the Calculation and Week pages.
+
+    Comes before QMainWindow in the bases. The page sets self.theme, implements
+    export_to_excel() and hands its ExportWorker to start_export().
+
+    Attributes:
+        export_excel_button (QPushButton): Starts export_to_excel(), disabled while exporting.
+        ok_button (QPushButton): Closes the page.
+        export_worker (ExportWorker or None): Running or last export.
+    """
+    def create_buttons(self):
+        """Create the Export Excel and OK buttons, returns their layout"""
+        self.export_excel_button = create_page_button("Export Excel", self.theme)
+        self.export_excel_button.clicked.connect(self.export_to_excel)
+        self.export_worker = None
 
+        self.ok_button = create_page_button("OK", self.theme)
+        self.ok_button.clicked.connect(self.close)
 
-class CalculatePage(QMainWindow):
-    def __init__(self, theme, font_family, list_rest_data, list_no_rest_data, settings):
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_excel_button, alignment=Qt.AlignRight)
+        button_layout.addWidget(self.ok_button, alignment=Qt.AlignRight)
+        button_layout.setContentsMargins(0, 0, 10, 10)
+        return button_layout
+
+    def export_directory(self):
+        # Directory picked by the user, empty when the dialog was cancelled
+        return str(QFileDialog.getExistingDirectory(self, "Select Directory", os.path.realpath(os.path.dirname(__file__)) ))
+
+    def start_export(self, worker):
+        """Runs an export in the background with a progress dialog"""
+        self.export_worker = worker
+        self.export_progress = worker.progress_dialog(self)
+        worker.failed.connect(self.export_failed)
+        worker.finished.connect(self.export_finished)
+        self.export_excel_button.setEnabled(False)
+        worker.start()
+
+    def export_failed(self, message):
+        QMessageBox.critical(self, "Error", f"An error occurred during export:\n{message}")
+
+    def export_finished(self):
+        self.export_progress.close()
+        self.export_excel_button.setEnabled(True)
+
+    def closeEvent(self, event):
+        # Let a running export stop before the page goes away
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.export_worker.cancel()
+            self.export_worker.wait()
+        super().closeEvent(event)
+
+
+class CalculatePage(ExportPageMixin, QMainWindow):
+    def __init__(self, theme, font_family, list_rest_data, list_no_rest_data, settings, plan=None):
         super().__init__()
         self.theme = theme
         self.fontFamilies = font_family
@@ -19,8 +118,8 @@ class CalculatePage(QMainWindow):
 
         # Table headers
         self.table_headers = [
-            ("Initial Activity Times", ["Activity", "Duration"]),
-            ("Activity Times", ["Activity", "Subduration", "Duration"]),
+            ("Initial Activity Times", ["Activity", "Duration", "Clock Time"]),
+            ("Activity Times", ["Activity", "Subduration", "Duration", "Clock Time"]),
             ("Daily Schedule Times", ["Activity", "Duration"])
         ]
 
@@ -45,32 +144,39 @@ class CalculatePage(QMainWindow):
         table_layout.setContentsMargins(10, 10, 10, 10)
 
 
-        # Calculate times
-        calc = CalculateTimes(self.list_rest_data, self.list_no_rest_data)
-        rest_data, no_rest_data= calc.calcualte_rest_times()
-
-        total_with_rest, total_without_rest = calc.calculate_total_times()
-
-        total_time_sec = total_with_rest + total_without_rest
-        reminder_time = (24*3600) - total_time_sec
-
+        # Calculate times (once, every table and the export read from this plan)
+        if plan is None:
+            plan = CalculateTimes(self.list_rest_data, self.list_no_rest_data).calculate_plan()
+        self.plan = plan
+        self.day_start = self.settings.get('Day_Start', DEFAULT_DAY_START)
+        # Joint activities with a start time are fixed, the others are placed around them
+        self.anchors = anchors_from_rows(self.list_rest_data, self.list_no_rest_data)
+        self.timeline = Timeline(self.plan, self.day_start, self.anchors)
+        if self.timeline.conflicts:
+            self.table_headers.append(("Conflicts", ["Activity", "Overlaps With"]))
+
+        # Over budget: propose what to shorten or drop so the plan fits in 24 hours
+        self.suggestions = None
+        if not self.plan.fits:
+            # Imported here so numpy is only loaded for plans that do not fit
+            from fit_plan import fit_to_day
+            self.suggestions = fit_to_day(self.list_rest_data, self.list_no_rest_data)
+            self.table_headers.append(("Suggested Times", ["Activity", "Duration", "Suggested"]))
 
         # Format time strings
-        total_with_rest_str = f"{total_with_rest // 3600:02}:{(total_with_rest % 3600) // 60:02}"
-        total_without_rest_str = f"{total_without_rest // 3600:02}:{(total_without_rest % 3600) // 60:02}"
-        total_time_str = f"{total_time_sec // 3600:02}:{(total_time_sec % 3600) // 60:02}"
-        reminder_time_str = f"{reminder_time // 3600:02}:{(reminder_time % 3600) // 60:02}"
-
-        
+        total_with_rest_str = format_hhmm(self.plan.total_with_rest)
+        total_without_rest_str = format_hhmm(self.plan.total_without_rest)
+        total_time_str = format_hhmm(self.plan.total)
+        reminder_time_str = format_hhmm(self.plan.remaining)
 
         for header, column_names in self.table_headers:
-            group_box = self.create_group_box(header)
+            group_box = create_group_box(header, self.fontFamilies['Group_Box'], self.theme)
             vbox = QVBoxLayout()
 
             # Prepare table data
             if header == "Daily Schedule Times":
 
-                status_text = "Yes" if total_time_sec <= (24*3600) else "No"
+                status_text = "Yes" if self.plan.fits else "No"
 
                 table_data = [
                     ['Time With Rest',total_with_rest_str],# ':'.join(str(total_time_with_rest_times).split(':')[:2])],
@@ -81,9 +187,18 @@ class CalculatePage(QMainWindow):
                 ]
 
             elif header == "Initial Activity Times":
-                table_data = self.list_rest_data + self.list_no_rest_data
+                table_data = [list(row) + [clock] for row, clock in zip(self.plan.activities, self.timeline.activity_texts())]
             elif header == "Activity Times":
-                table_data = rest_data + no_rest_data
+                table_data = [list(row) + [clock] for row, clock in zip(self.plan.rows, self.timeline.row_texts(self.plan.rows))]
+            elif header == "Conflicts":
+                table_data = [[self.plan.activities[first][0], self.plan.activities[second][0]]
+                              for first, second in self.timeline.conflicts]
+            elif header == "Suggested Times":
+                if self.suggestions is None:
+                    table_data = [["Kept activities exceed 24 hours", "", ""]]
+                else:
+                    table_data = [[s.name, f"{s.minutes // 60}:{s.minutes % 60:02}", s.duration if s.suggested else "Drop"]
+                                  for s in self.suggestions if s.changed]
 
 
             row_limit = 5 if header == "Daily Schedule Times" else None
@@ -106,77 +221,11 @@ class CalculatePage(QMainWindow):
         main_layout.addLayout(table_layout)
 
         # Create buttons
-        self.export_excel_button = QPushButton("Export Excel")
-        self.export_excel_button.setFixedSize(200, 50)
-        self.export_excel_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.theme['Header']};
-                color: {self.theme['Text']};
-                border: 2px solid {self.theme['Header']};
-                padding: 10px 25px;
-                font-size: 18px;
-                border-radius: 6px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.theme['Hover']};
-                border: 2px solid {self.theme['Hover']};
-                color: white;
-            }}
-        """)
-        self.export_excel_button.clicked.connect(self.export_to_excel)
-
-        self.ok_button = QPushButton("OK")
-        self.ok_button.setFixedSize(200, 50)
-        self.ok_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.theme['Header']};
-                color: {self.theme['Text']};
-                border: 2px solid {self.theme['Header']};
-                padding: 10px 25px;
-                font-size: 18px;
-                border-radius: 6px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.theme['Hover']};
-                border: 2px solid {self.theme['Hover']};
-                color: white;
-            }}
-        """)
-        self.ok_button.clicked.connect(self.close)
-
-        button_layout = QHBoxLayout()
-        button_layout.addStretch()
-        button_layout.addWidget(self.export_excel_button, alignment=Qt.AlignRight)
-        button_layout.addWidget(self.ok_button, alignment=Qt.AlignRight)
-        button_layout.setContentsMargins(0, 0, 10, 10)
-
-        main_layout.addLayout(button_layout)
-
-    def create_group_box(self, header):
-        """Create styled group box"""
-        group_box = QGroupBox()
-        group_box.setFlat(True)
-        group_box.setTitle(header)
-        group_box.setFont(self.fontFamilies['Group_Box'])
-        group_box.setAlignment(Qt.AlignCenter)
-        group_box.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {self.theme['Table']};
-                border: 0px;
-                color: {self.theme['HeaderText']};
-                border-radius: 6px;
-                margin: 5px;
-            }}
-        """)
-        return group_box
-    
+        main_layout.addLayout(self.create_buttons())
 
     def export_to_excel(self):
-        """Export data to Excel"""
-        all_activities_list = self.list_rest_data + self.list_no_rest_data
-        all_activities_list = [activity for activity in all_activities_list if activity[0] != 'Sleep']
-        file = str(QFileDialog.getExistingDirectory(self, "Select Directory", os.path.realpath(os.path.dirname(__file__)) ))
-        ExcelTable(all_activities_list,"Fa", file).create_excel()
-        ExcelTable(all_activities_list,"En", file).create_excel()
\ No newline at end of file
+        """Export data to Excel (FA and EN together, in the background with a progress dialog)"""
+        file = self.export_directory()
+        if not file:
+            return
+        self.start_export(ExportWorker.from_plan(self.plan, file, self.day_start, self.anchors, parent=self))
@@ -4,8 +4,31 @@ from PyQt5.QtCore import Qt, QRegExp
 from PyQt5.QtGui import QValidator
 from PyQt5.QtWidgets import QComboBox
 from PyQt5.QtGui import QRegExpValidator
+from duration_parser import parse_duration, parse_durations
 from PyQt5.QtWidgets import (QTableWidget, QStyledItemDelegate, QMenu, QLineEdit, QCompleter, 
-                             QAbstractItemView, QHeaderView, QSizePolicy, QTableWidgetItem, QTimeEdit)
+                             QAbstractItemView, QHeaderView, QSizePolicy, QTableWidgetItem)
+
+# Durations are entered per day, so they must be shorter than 24 hours
+MAX_MINUTES = 24 * 60
+# Characters of a duration being typed: "1:30", "1h30m" or "90"
+DURATION_CHARS = re.compile(r"[\d\s:hmHM]*")
+
+
+class DurationValidator(QValidator):
+    """
+    Accepts the durations of duration_parser.parse_duration() that are shorter than a day.
+
+    Text that can still become a duration ("1:", "2h") is intermediate, so it can be typed
+    but not committed.
+    """
+    def validate(self, text, pos):
+        minutes = parse_duration(text)
+        if minutes is not None and minutes < MAX_MINUTES:
+            return QValidator.Acceptable, text, pos
+        if DURATION_CHARS.fullmatch(text):
+            return QValidator.Intermediate, text, pos
+        return QValidator.Invalid, text, pos
+
 
 class CustomTable(QTableWidget):
     """
@@ -17,8 +40,9 @@ class CustomTable(QTableWidget):
         theme (dict): A dictionary of colors for styling the table.
         font_families (dict): A dictionary containing font settings for the table and headers.
         data (dict): A dictionary containing data to be used for autocompletion.
+        has_start (bool): Whether the table has an optional "Start" column for activities at a fixed time.
     """
-    def __init__(self, theme, font_family, data):
+    def __init__(self, theme, font_family, data, has_start=False):
         """
         Initializes the custom table with specified theme, font family, and data.
         
@@ -26,13 +50,15 @@ class CustomTable(QTableWidget):
             theme (dict): Dictionary containing color themes for table styling.
             font_family (dict): Dictionary containing font settings for the table.
             data (dict): Dictionary of data to be used for autocompletion.
+            has_start (bool): Add the optional "Start" column (fixed start time of the activity).
         """
         super().__init__()
         self.data = data
         self.theme = theme
         self.font_families = font_family
-        self.setColumnCount(2)
-        self.setHorizontalHeaderLabels(["Activity Name", "Duration"])
+        self.has_start = has_start
+        self.setColumnCount(3 if has_start else 2)
+        self.setHorizontalHeaderLabels(["Activity Name", "Duration", "Start"][:self.columnCount()])
         self.setSelectionMode(QTableWidget.SingleSelection)
         self.setSelectionBehavior(QTableWidget.SelectRows)
         self.setRowHeight(0, 60)
@@ -46,6 +72,8 @@ class CustomTable(QTableWidget):
         self.verticalHeader().hide()
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        if has_start:
+            self.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
         sizePolicy = QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -120,6 +148,12 @@ class CustomTable(QTableWidget):
             if current_row == 0:
                 self.Create_new_row()
 
+        elif event.key() == Qt.Key_Backspace and self.has_start and self.currentColumn() == 2:
+            # An empty start makes the activity flexible again
+            current_item = self.currentItem()
+            if current_item:
+                current_item.setText("")
+
         elif event.key() in (Qt.Key_Return, Qt.Key_Enter):
             self.Create_new_row()
 
@@ -296,36 +330,75 @@ class CustomTable(QTableWidget):
         Returns:
             list: A list of lists containing the name and duration from each row.
         """
-        data = []
+        return self.parse_rows()[0]
+
+    def parse_rows(self):
+        """
+        Parses all rows at once with the shared duration parser.
+
+        Returns:
+            tuple: (rows, errors) where rows are the row_data() lists of the valid rows and
+                   errors is a list of (row number, message) for half-filled or invalid rows.
+        """
+        filled = []
+        errors = []
         for row in range(self.rowCount()):
-            name_item = self.item(row, 0)
-            duration_item = self.item(row, 1)
-            
-            if not name_item or not duration_item:
+            name, duration = self.cell_text(row, 0), self.cell_text(row, 1)
+            if name and duration:
+                filled.append((row, name, duration))
+            elif name or duration:
+                errors.append((row + 1, "Activity name is empty" if duration else "Duration is empty"))
+
+        data = []
+        values, parse_errors = parse_durations(duration for _, _, duration in filled)
+        errors += [(filled[position][0] + 1, message) for position, message in parse_errors]
+        for (row, name, duration), minutes in zip(filled, values):
+            if minutes is None:
                 continue
-                
-            name = name_item.text().strip()
-            duration = duration_item.text().strip()
-            
-            if not name and not duration:
+            if minutes >= MAX_MINUTES:
+                errors.append((row + 1, f"Duration '{duration}' is longer than a day"))
                 continue
-                
-            if duration:  
-                time_parts = duration.split(':')
-                if len(time_parts) != 2 or not all(part.isdigit() for part in time_parts):
-                    continue  
-                    
-                hours, minutes = map(int, time_parts)
-                if hours < 0 or hours > 23 or minutes < 0 or minutes > 59:
-                    continue  
-                    
-            if name and duration:
-                data.append([name, duration])
-                
-        return data
+            data.append(self.make_row(row, name, duration))
+
+        errors.sort()
+        return data, errors
+
+    def row_data(self, row):
+        """
+        Retrieves the name and duration of one row.
 
+        Args:
+            row (int): Row index.
 
-    def add_row(self, name, duration):
+        Returns:
+            list or None: [name, duration] if both are filled and the duration is valid and shorter than a day,
+                          else None. [name, duration, start] when the row also has a valid HH:MM start time.
+        """
+        name, duration = self.cell_text(row, 0), self.cell_text(row, 1)
+        if not name or not duration:
+            return None
+
+        minutes = parse_duration(duration)
+        if minutes is None or minutes >= MAX_MINUTES:
+            return None
+        return self.make_row(row, name, duration)
+
+    def cell_text(self, row, column):
+        item = self.item(row, column)
+        return item.text().strip() if item else ""
+
+    def make_row(self, row, name, duration):
+        # [name, duration] plus the start time when the table has one and it is valid
+        start = self.cell_text(row, 2) if self.has_start else ""
+        if start:
+            start_parts = start.split(':')
+            if (len(start_parts) == 2 and all(part.isdigit() for part in start_parts)
+                    and int(start_parts[0]) <= 23 and int(start_parts[1]) <= 59):
+                return [name, duration, start]
+        return [name, duration]
+
+
+    def add_row(self, name, duration, start=""):
         if name.strip() == "" and duration.strip() == "":
             return  
             
@@ -337,6 +410,10 @@ class CustomTable(QTableWidget):
         item_duration.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
         self.setItem(row, 0, item_name)
         self.setItem(row, 1, item_duration)
+        if self.has_start:
+            item_start = QTableWidgetItem(start.strip())
+            item_start.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
+            self.setItem(row, 2, item_start)
 
 
 class TableItemCompleter(QStyledItemDelegate):
@@ -407,10 +484,17 @@ class TableItemCompleter(QStyledItemDelegate):
     #     return editor
 
     def createEditor(self, parent, option, index):
-        if index.column() == 1:  # Duration column
-            editor = QTimeEdit(parent)
-            editor.setDisplayFormat("HH:mm")
-            editor.setTime(QtCore.QTime(0, 0))
+        if index.column() == 1:  # Duration column: H:MM, 1h30m or minutes
+            editor = QLineEdit(parent)
+            editor.setContextMenuPolicy(Qt.NoContextMenu)
+            editor.setPlaceholderText("H:MM, 1h30m or minutes")
+            editor.setValidator(DurationValidator(editor))
+            return editor
+        elif index.column() == 2:  # Start column, optional: empty keeps the activity unanchored
+            editor = QLineEdit(parent)
+            editor.setContextMenuPolicy(Qt.NoContextMenu)
+            editor.setPlaceholderText("HH:MM")
+            editor.setValidator(QRegExpValidator(QRegExp("(([01]?[0-9]|2[0-3]):[0-5][0-9])?"), editor))
             return editor
         else:
             editor = QLineEdit(parent)
@@ -432,8 +516,12 @@ class TableItemCompleter(QStyledItemDelegate):
     #     model.setData(index, editor.text().strip())
 
     def setModelData(self, editor, model, index):
-        if isinstance(editor, QTimeEdit):
-            time = editor.time()
-            model.setData(index, time.toString("HH:mm"))
+        if index.column() in (1, 2) and not editor.hasAcceptableInput():
+            # A half typed duration or start time ("12:") keeps the previous value
+            return
+        elif index.column() == 1:
+            # Stored as HH:MM, like the rows of the plan files
+            minutes = parse_duration(editor.text())
+            model.setData(index, f"{minutes // 60:02}:{minutes % 60:02}")
         else:
             model.setData(index, editor.text().strip())
\ No newline at end of file
@@ -1,16 +1,16 @@
 import os
-from PyQt5.QtCore import QEvent
+from PyQt5.QtCore import QEvent, QTime
 from styles import color_palette
 from PyQt5 import QtWidgets, QtCore
 from utils import change_image_color
 from PyQt5.QtGui import QPalette, QColor
-from PyQt5.QtWidgets import QVBoxLayout, QLabel, QHBoxLayout, QDialog, QComboBox, QFormLayout, QPushButton
+from PyQt5.QtWidgets import QVBoxLayout, QLabel, QHBoxLayout, QDialog, QComboBox, QFormLayout, QPushButton, QTimeEdit
 
 class SettingsForm(QDialog):
     """
     A dialog window for application settings configuration.
     
-    This form allows users to modify theme, font, and number display settings.
+    This form allows users to modify theme, font, number display and day start settings.
     Changes can be saved or canceled.
     
     Attributes:
@@ -172,6 +172,10 @@ class SettingsForm(QDialog):
             }}
         """)
 
+        # Day start styling
+        self.day_start_label.setStyleSheet(f"color: {self.theme['Text']}; font-size: 14px;")
+        self.day_start_edit.setStyleSheet(self.time_edit_style())
+
         # OK button styling
         self.ok_button.setStyleSheet(f"""
             QPushButton {{
@@ -318,6 +322,15 @@ class SettingsForm(QDialog):
         self.number_display_combo.installEventFilter(self)
         self.form_layout.addRow(self.number_display_label, self.number_display_combo)
 
+        # Day start, first planned activity of the calculation page begins at this time
+        self.day_start_label = QLabel("Day Start:")
+        self.day_start_label.setStyleSheet(f"color: {self.theme['Text']}; font-size: 14px;")
+        self.day_start_edit = QTimeEdit()
+        self.day_start_edit.setDisplayFormat("HH:mm")
+        self.day_start_edit.setTime(QTime.fromString(self.settings.get('Day_Start', '08:00'), "HH:mm"))
+        self.day_start_edit.setStyleSheet(self.time_edit_style())
+        self.form_layout.addRow(self.day_start_label, self.day_start_edit)
+
         self.layout.addLayout(self.form_layout)
         self.layout.addSpacerItem(QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding))
 
@@ -372,6 +385,23 @@ class SettingsForm(QDialog):
 
         self.setLayout(self.layout)
 
+    def time_edit_style(self):
+        """Style sheet of the day start time edit for the current theme."""
+        return f"""
+            QTimeEdit {{
+                background-color: {self.theme['Button']};
+                color: {self.theme['Text']};
+                border: 2px solid {self.theme['Header']};
+                padding: 5px;
+                font-size: 14px;
+                border-radius: 6px;
+                font-weight: bold;
+            }}
+            QTimeEdit:hover {{
+                border: 2px solid {self.theme['Hover']};
+            }}
+        """
+
     def eventFilter(self, obj, event):
         """
         Handle hover events for combo boxes.
@@ -472,7 +502,7 @@ class SettingsForm(QDialog):
         """
         Handle OK button click - save settings to file and accept dialog.
         
-        Saves the current theme, font, and number format settings to a file.
+        Saves the current theme, font, number format and day start settings to a file.
         """
         selected_font = self.font_combo.currentText()
         selected_number_display = self.number_display_combo.currentText()
@@ -481,6 +511,7 @@ class SettingsForm(QDialog):
         self.settings['Theme'] = selected_theme
         self.settings['Font'] = selected_font
         self.settings['Number_Format'] = selected_number_display
+        self.settings['Day_Start'] = self.day_start_edit.time().toString("HH:mm")
 
         # Save settings to file
         with open(self.parent().dir_path + "\\Files\\settings.dat", "w") as file:
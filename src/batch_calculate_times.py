@@ -0,0 +1,127 @@
+import numpy as np
+from calculate_times import CalculateTimes, PlanResult, format_blocks, day_seconds
+from duration_parser import parse_duration, duration_error
+
+# Blocks of a skipped row, repeated into the object array of PlanResult.blocks
+EMPTY_BLOCKS = np.empty(1, dtype=object)
+EMPTY_BLOCKS[0] = ()
+
+
+class BatchCalculateTimes(CalculateTimes):
+    """
+    Array based version of CalculateTimes for large plans.
+
+    Durations are kept as integer minutes in NumPy arrays, so parsing is the only step
+    with Python work per row: long tasks are split with array operations, and rest
+    times, totals and row texts are worked out once per distinct duration (a day has
+    at most 1440) and spread to the rows by index. The returned lists are exactly the
+    same as the ones returned by CalculateTimes.
+    """
+    def calculate_plan(self):
+        # Runs the array pipeline once for both lists and returns a PlanResult
+        self.errors = []
+        rows = []
+        totals = []
+        blocks = np.repeat(EMPTY_BLOCKS, len(self.list_with_rest) + len(self.list_without_rest))
+        for offset, times_list, has_rest in ((0, self.list_with_rest, True),
+                                             (len(self.list_with_rest), self.list_without_rest, False)):
+            names, minutes, indices = self.convert_list_to_arrays(times_list)
+            if has_rest:
+                names, minutes, indices = self.split_long_tasks_array(names, minutes, indices)
+            tuples, inverse = self.block_tuples(minutes, has_rest)
+            rows.append(tuple(self.convert_arrays_to_list(names, tuples, inverse)))
+            totals.append(self.total_seconds(tuples, inverse))
+            sources, row_blocks = self.blocks_by_row(tuples[inverse], indices)
+            blocks[offset + sources] = row_blocks
+
+        return PlanResult(
+            activities=tuple((v[0], v[1]) for v in list(self.list_with_rest) + list(self.list_without_rest)),
+            rest_rows=rows[0],
+            no_rest_rows=rows[1],
+            total_with_rest=totals[0],
+            total_without_rest=totals[1],
+            errors=tuple(self.errors),
+            blocks=tuple(blocks.tolist()),
+        )
+
+    def convert_list_to_arrays(self, times_list):
+        # Converts list of [name, time_str] into names, int minutes and source row index arrays
+        names = []
+        minutes = []
+        indices = []
+        # Plans repeat a few hundred duration texts, each is parsed once
+        parsed = {}
+        for index, v in enumerate(times_list):
+            if not v[0].strip() or not v[1].strip():
+                continue
+            value = parsed.get(v[1], -1)
+            if value == -1:
+                value = parsed[v[1]] = parse_duration(v[1])
+            if value is None:
+                self.errors.append(f"Skipping invalid activity '{v[0]}' with time '{v[1]}': {duration_error(v[1])}")
+                continue
+            names.append(v[0])
+            minutes.append(value)
+            indices.append(index)
+
+        return np.array(names, dtype=object), np.array(minutes, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+    def split_long_tasks_array(self, names, minutes, indices):
+        # Splits long tasks into chunks (>= 5 hours into 4-hour chunks by default)
+        chunk = self.rules.chunk
+        is_long = minutes >= self.rules.split_at
+        chunk_counts = np.where(is_long, -(-minutes // chunk), 1)
+        if chunk_counts.sum() == len(minutes):
+            return names, minutes, indices
+
+        source = np.repeat(np.arange(len(minutes)), chunk_counts)
+        first_chunk = np.cumsum(chunk_counts) - chunk_counts
+        position = np.arange(len(source)) - np.repeat(first_chunk, chunk_counts)
+        remaining = minutes[source] - position * chunk
+        chunks = np.where(is_long[source], np.minimum(remaining, chunk), remaining)
+        return names[source], chunks, indices[source]
+
+    def block_tuples(self, minutes, has_rest=True):
+        """
+        Work/rest blocks of every distinct duration, so each is broken down and formatted once.
+
+        Returns:
+            tuple: (tuples, inverse) where tuples is an object array of the block tuples of the
+                   distinct durations and tuples[inverse] gives the blocks of each row.
+        """
+        unique, inverse = np.unique(minutes, return_inverse=True)
+        tuples = np.empty(len(unique), dtype=object)
+        breakdown = self.rules.breakdown
+        for position, value in enumerate(unique.tolist()):
+            tuples[position] = breakdown(value) if has_rest else (value,)
+        return tuples, inverse
+
+    def blocks_by_row(self, chunk_blocks, indices):
+        """
+        Joins the blocks of the chunks of each source row (chunks of a split task are next to each other).
+
+        Returns:
+            tuple: (source row indices, object array of their block tuples).
+        """
+        if len(indices) == 0:
+            return indices, chunk_blocks
+        starts = np.flatnonzero(np.concatenate(([True], indices[1:] != indices[:-1])))
+        row_blocks = chunk_blocks[starts]
+        # Only the split tasks need a join, the other rows keep the tuple of their only chunk
+        counts = np.diff(np.concatenate((starts, [len(indices)])))
+        for row in np.flatnonzero(counts > 1).tolist():
+            first = starts[row]
+            row_blocks[row] = sum(chunk_blocks[first:first + counts[row]].tolist(), ())
+        return indices[starts], row_blocks
+
+    def total_seconds(self, tuples, inverse):
+        # Sums the blocks in seconds (modulo one day, like timedelta.seconds), once per distinct duration
+        seconds = np.array([sum(day_seconds(block) for block in blocks) for blocks in tuples.tolist()], dtype=np.int64)
+        return int(np.bincount(inverse, minlength=len(tuples)).dot(seconds)) if len(tuples) else 0
+
+    def convert_arrays_to_list(self, names, tuples, inverse):
+        # (name, sub durations, duration) rows, the texts formatted once per distinct duration
+        texts = [format_blocks(blocks) for blocks in tuples.tolist()]
+        subs = np.array([sub for sub, _ in texts], dtype=object)
+        durations = np.array([duration for _, duration in texts], dtype=object)
+        return zip(names.tolist(), subs[inverse].tolist(), durations[inverse].tolist())
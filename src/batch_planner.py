@@ -0,0 +1,73 @@
+import os
+import glob
+from utils import load_lists
+from dataclasses import dataclass, field
+from timeline import anchors_from_rows
+from calculate_times import CalculateTimes
+from concurrent.futures import ProcessPoolExecutor
+
+
+@dataclass(frozen=True)
+class PlanFileResult:
+    """
+    Result of one plan file of a batch.
+
+    Attributes:
+        path (str): Path of the plan file.
+        plan (PlanResult or None): The calculated plan, None if the file could not be read.
+        errors (tuple): File level error and messages of the skipped rows.
+        anchors (dict): Fixed start times by activity index, like timeline.anchors_from_rows().
+    """
+    path: str
+    plan: object
+    errors: tuple = ()
+    anchors: dict = field(default_factory=dict)
+
+
+def plan_file(file_path):
+    # Worker: reads and calculates one file, errors are returned instead of raised
+    try:
+        lists = load_lists(file_path)
+        plan = CalculateTimes(*lists).calculate_plan()
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return PlanFileResult(file_path, None, (f"Could not read '{file_path}': {e}",))
+    try:
+        anchors = anchors_from_rows(*lists)
+    except ValueError as e:
+        return PlanFileResult(file_path, None, (f"Invalid start time in '{file_path}': {e}",))
+    return PlanFileResult(file_path, plan, plan.errors, anchors)
+
+
+def plan_files(file_paths, workers=None, chunksize=None):
+    """
+    Calculates many plan files in parallel on a process pool.
+
+    Args:
+        file_paths (list): Paths of last_info.dat style plan files.
+        workers (int or None): Number of processes (CPU count when None).
+        chunksize (int or None): Files sent to a worker at once (about 4 chunks per worker when None).
+
+    Returns:
+        list: PlanFileResult for each file, in the same order as file_paths.
+    """
+    file_paths = list(file_paths)
+    workers = workers or os.cpu_count() or 1
+    # A pool costs more than it saves for a handful of files
+    if workers == 1 or len(file_paths) < 2:
+        return [plan_file(path) for path in file_paths]
+
+    if chunksize is None:
+        chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+        return list(executor.map(plan_file, file_paths, chunksize=chunksize))
+
+
+def plan_directory(directory, pattern="*.dat", workers=None, chunksize=None):
+    """
+    Calculates every plan file of a directory that matches pattern, sorted by file name.
+
+    Returns:
+        list: PlanFileResult for each file.
+    """
+    file_paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    return plan_files(file_paths, workers, chunksize)
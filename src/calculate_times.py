@@ -1,166 +1,218 @@
+from dataclasses import dataclass
 from datetime import timedelta
+from functools import lru_cache
+from utils import load_lists
+from rest_rules import load_rest_rules
+from duration_parser import parse_duration, duration_error
+
+DAY_SECONDS = 24 * 3600
+
+
+def format_hhmm(seconds):
+    # Formats a number of seconds as "HH:MM"
+    return f"{seconds // 3600:02}:{(seconds % 3600) // 60:02}"
+
+
+def format_duration(minutes):
+    # Formats a number of minutes as "H:MM:SS" (same text as str(timedelta))
+    if 0 <= minutes < 24 * 60:
+        return f"{minutes // 60}:{minutes % 60:02}:00"
+    return str(timedelta(minutes=minutes))
+
+
+@lru_cache(maxsize=None)
+def format_blocks(blocks):
+    # (sub durations, duration) texts of a block tuple; plans reuse the few tuples of the rest table
+    return '\n'.join(map(format_duration, blocks)), format_duration(sum(blocks))
+
+
+def day_seconds(minutes):
+    # Seconds of a duration modulo one day, like timedelta.seconds
+    return (minutes * 60) % DAY_SECONDS
+
+
+class Activity:
+    """
+    One activity (or one chunk of a long activity) in the calculation pipeline.
+
+    Attributes:
+        name (str): Activity name.
+        minutes (int): Duration in minutes.
+        blocks (tuple): Work and rest blocks in minutes, filled by add_rest_times.
+        index (int): Position of the source row in the input list (shared by the chunks of a split task).
+    """
+    __slots__ = ('name', 'minutes', 'blocks', 'index')
+
+    def __init__(self, name, minutes, blocks=(), index=None):
+        self.name = name
+        self.minutes = minutes
+        self.blocks = blocks
+        self.index = index
+
+
+@dataclass(frozen=True)
+class PlanResult:
+    """
+    Result of one run of the calculation pipeline.
+
+    Attributes:
+        activities (tuple): Initial (name, duration) rows, activities with rest first.
+        rest_rows (tuple): (name, sub durations, duration) rows of activities with rest.
+        no_rest_rows (tuple): (name, sub durations, duration) rows of activities without rest.
+        total_with_rest (int): Total seconds of activities with rest, rest blocks included.
+        total_without_rest (int): Total seconds of activities without rest.
+        errors (tuple): Messages of the input rows that were skipped.
+        blocks (tuple): Work/rest blocks in minutes of each entry of activities, all chunks
+                        of a split task together (empty for skipped rows).
+    """
+    activities: tuple
+    rest_rows: tuple
+    no_rest_rows: tuple
+    total_with_rest: int
+    total_without_rest: int
+    errors: tuple = ()
+    blocks: tuple = ()
+
+    @property
+    def total(self):
+        return self.total_with_rest + self.total_without_rest
+
+    @property
+    def remaining(self):
+        return DAY_SECONDS - self.total
+
+    @property
+    def fits(self):
+        return self.total <= DAY_SECONDS
+
+    @property
+    def rows(self):
+        # All calculated rows in display order
+        return self.rest_rows + self.no_rest_rows
+
 
 class CalculateTimes:
-    def __init__(self, list_with_rest, list_without_rest):
-        # Input: two lists of activities with time strings (with and without rest)
+    def __init__(self, list_with_rest, list_without_rest, rules=None):
+        # Input: two lists of activities with time strings (with and without rest),
+        # rows may carry a third "HH:MM" start time that only the timeline uses
+        # and the rest policy (Files/rest_rules.dat when not given)
         self.list_with_rest = list_with_rest
         self.list_without_rest = list_without_rest
+        self.rules = rules if rules is not None else load_rest_rules()
+        # Messages of skipped rows, collected instead of printed
+        self.errors = []
+
+    def calculate_plan(self):
+        # Runs parse -> split -> add rest once for both lists and returns a PlanResult
+        self.errors = []
+
+        # Convert, split long tasks and add rest times to the list with rest
+        activities_with_rest = self.convert_list_to_activities(self.list_with_rest)
+        activities_with_rest = self.split_long_tasks(activities_with_rest)
+        activities_with_rest = self.add_rest_times(activities_with_rest)
+
+        # The list without rest is only converted
+        activities_without_rest = self.convert_list_to_activities(self.list_without_rest)
+        activities_without_rest = self.add_rest_times(activities_without_rest, has_rest=False)
+
+        # Blocks of every input row (chunks of a split task share the row index)
+        blocks = [()] * (len(self.list_with_rest) + len(self.list_without_rest))
+        for item in activities_with_rest:
+            blocks[item.index] += item.blocks
+        for item in activities_without_rest:
+            blocks[len(self.list_with_rest) + item.index] += item.blocks
+
+        return PlanResult(
+            activities=tuple((v[0], v[1]) for v in list(self.list_with_rest) + list(self.list_without_rest)),
+            rest_rows=self.convert_activities_to_list(activities_with_rest),
+            no_rest_rows=self.convert_activities_to_list(activities_without_rest),
+            total_with_rest=self.total_seconds(activities_with_rest),
+            total_without_rest=self.total_seconds(activities_without_rest),
+            errors=tuple(self.errors),
+            blocks=tuple(blocks),
+        )
+
+    def calculate_activity(self, name, timestr, has_rest=True):
+        # Runs the pipeline on a single row and returns its processed Activity records
+        activities = self.convert_list_to_activities([[name, timestr]])
+        if has_rest:
+            activities = self.split_long_tasks(activities)
+        return self.add_rest_times(activities, has_rest)
+
+    def total_seconds(self, activities):
+        # Sums all blocks of processed activities (in seconds)
+        return sum(day_seconds(b) for item in activities for b in item.blocks)
 
     def calcualte_rest_times(self):
         # Calculates activity times with and without rest (returns lists)
-        
-        # Convert initial list to dictionaries
-        time_with_rest_dict = self.convert_list_to_dict(self.list_with_rest)
-        # Split long tasks (>= 5 hours) into smaller chunks
-        time_with_rest_dict = self.split_long_tasks(time_with_rest_dict)
-        # Add appropriate rest times
-        time_with_rest_dict = self.add_rest_times(time_with_rest_dict)
-
-
-        # Do the same for the list without rest
-        time_without_rest_dict = self.convert_list_to_dict(self.list_without_rest)
-        time_without_rest_dict = self.add_rest_times(time_without_rest_dict, has_rest=False)
-
-
-        # Convert back to list format
-        time_with_rest_dict = self.convert_dict_to_list(time_with_rest_dict)
-        time_without_rest_dict = self.convert_dict_to_list(time_without_rest_dict)
-    
-        return time_with_rest_dict, time_without_rest_dict
+        plan = self.calculate_plan()
+        return [list(row) for row in plan.rest_rows], [list(row) for row in plan.no_rest_rows]
 
     def calculate_total_times(self):
         # Calculates total time (in seconds) with and without rest
-        total_with_rest_seconds = 0
-        total_without_rest_seconds = 0
-
-        # Convert and process list with rest
-        time_with_rest_dict = self.convert_list_to_dict(self.list_with_rest)
-        time_with_rest_dict = self.split_long_tasks(time_with_rest_dict)
-        time_with_rest_dict = self.add_rest_times(time_with_rest_dict)
-
-
-        # Convert and process list without rest
-        time_without_rest_dict = self.convert_list_to_dict(self.list_without_rest)
-        time_without_rest_dict = self.add_rest_times(time_without_rest_dict, has_rest=False)
-
-
-        # Sum time with rest
-        for item in time_with_rest_dict:
-            for i in item['time_with_rest']:
-                total_with_rest_seconds += i.seconds
-
-        # Sum time without rest
-        for item in time_without_rest_dict:
-            total_without_rest_seconds += item['time'].seconds
-
-        return total_with_rest_seconds, total_without_rest_seconds
-
-    def split_long_tasks(self, time_dict):
-        # Splits tasks longer than or equal to 5 hours into 4-hour chunks
-        new_time_dict = []
-        for item in time_dict:
-            if item['time'] >= timedelta(hours=5):
-                # Split into 4-hour chunks
-                remaining_time = item['time']
-                while remaining_time > timedelta(hours=0):
-                    chunk = min(remaining_time, timedelta(hours=4))
-                    new_time_dict.append({
-                        'name': item['name'],
-                        'time': chunk
-                    })
-                    remaining_time -= chunk
+        plan = self.calculate_plan()
+        return plan.total_with_rest, plan.total_without_rest
+
+    def split_long_tasks(self, activities):
+        # Splits long tasks into chunks (>= 5 hours into 4-hour chunks by default)
+        new_activities = []
+        for item in activities:
+            if item.minutes >= self.rules.split_at:
+                new_activities.extend(Activity(item.name, chunk, index=item.index) for chunk in self.rules.split(item.minutes))
             else:
-                new_time_dict.append(item)
-        return new_time_dict
+                new_activities.append(item)
+        return new_activities
+
+    def timestr_to_minutes(self, timestr):
+        # Converts a duration ("hh:mm", "1h30m" or minutes) into a number of minutes, ValueError if it is not one
+        minutes = parse_duration(timestr or "")
+        if minutes is None:
+            raise ValueError(duration_error(timestr or ""))
+        return minutes
 
     def timestr_spliter(self, timestr):
         # Converts time string "hh:mm" into a timedelta object
-        try:
-            if not timestr or ':' not in timestr:
-                raise ValueError("Invalid time format")
-                
-            time_parts = timestr.split(':')
-            if len(time_parts) != 2:
-                raise ValueError("Time should be in hh:mm format")
-                
-            hours = time_parts[0].strip()
-            minutes = time_parts[1].strip()
-            
-            if not hours or not minutes:
-                raise ValueError("Hours and minutes cannot be empty")
-                
-            return timedelta(hours=int(hours), minutes=int(minutes))
-        except ValueError as e:
-            raise ValueError(f"Invalid time format '{timestr}'. Please use hh:mm format. Error: {str(e)}")
-
-    def convert_list_to_dict(self, times_list):
-        # Converts list of [name, time_str] into list of dictionaries with 'name' and 'time' as timedelta
+        return timedelta(minutes=self.timestr_to_minutes(timestr))
+
+    def convert_list_to_activities(self, times_list):
+        # Converts list of [name, time_str] into list of Activity records (bad rows are collected, nothing is raised)
         valid_items = []
-        for v in times_list:
-            try:
-                if not v[0].strip() or not v[1].strip():
-                    continue
-                time_delta = self.timestr_spliter(v[1])
-                valid_items.append({'name': v[0], 'time': time_delta})
-            except ValueError as e:
-                print(f"Skipping invalid activity '{v[0]}' with time '{v[1]}': {str(e)}")
+        for index, v in enumerate(times_list):
+            if not v[0].strip() or not v[1].strip():
                 continue
-                
+            minutes = parse_duration(v[1])
+            if minutes is None:
+                self.errors.append(f"Skipping invalid activity '{v[0]}' with time '{v[1]}': {duration_error(v[1])}")
+                continue
+            valid_items.append(Activity(v[0], minutes, index=index))
+
         return valid_items
-    
-    def convert_dict_to_list(self, times_dict):
-        # Converts processed dicts (with rest times) back into list format
-        final_list = []
-        for item in times_dict:
-            total_time = timedelta(hours=0, minutes=0)
-            time_with_rest = ""
-            for i in item['time_with_rest']:
-                time_with_rest += str(i) + '\n'
-                total_time += i
-            final_list.append([item['name'], time_with_rest.strip(), str(total_time)])
-
-        return final_list
-
-    def add_rest_times(self, time_dict, has_rest=True):
-        # Adds rest times based on task duration
+
+    def convert_activities_to_list(self, activities):
+        # Converts processed activities (with rest times) into (name, sub durations, duration) rows
+        return tuple((item.name,) + format_blocks(item.blocks) for item in activities)
+
+    def add_rest_times(self, activities, has_rest=True):
+        # Adds rest times based on task duration, as given by the rest rules
         if not has_rest:
-            for item in time_dict:
-                item['time_with_rest'] = [item['time']]
-        else:        
-            for item in time_dict:
-                if item['time'] < timedelta(hours=0, minutes=30):
-                    item['time_with_rest'] = [item['time'],
-                                            timedelta(hours=0, minutes=5),]
-                elif item['time'] < timedelta(hours=2, minutes=0):
-                    item['time_with_rest'] = [item['time'], 
-                                            timedelta(hours=0, minutes=10)]
-                elif item['time'] <= timedelta(hours=3, minutes=0, seconds=0):
-                    mid_time = item['time']/2
-                    if int(str(item['time']).split(':')[1]) % 2 == 0:
-                        item['time_with_rest'] = [mid_time, 
-                                                timedelta(hours=0, minutes=10),
-                                                mid_time, 
-                                                timedelta(hours=0, minutes=15)]
-                    else:
-                        item['time_with_rest'] = [mid_time + timedelta(seconds=30),
-                                                timedelta(hours=0, minutes=10), 
-                                                mid_time - timedelta(seconds=30), 
-                                                timedelta(hours=0, minutes=15)]
-                elif item['time'] < timedelta(hours=5, minutes=0):
-                    time1 = item['time']-timedelta(hours=1, minutes=0, seconds=0)
-                    mid_time = time1/2
-                    if int(str(time1).split(':')[1]) % 2 == 0:
-                        item['time_with_rest'] = [timedelta(hours=1, minutes=0), 
-                                                timedelta(hours=0, minutes=10), 
-                                                mid_time,
-                                                timedelta(hours=0, minutes=10), 
-                                                mid_time,
-                                                timedelta(hours=0, minutes=20)]
-                    else:
-                        item['time_with_rest'] = [timedelta(hours=1, minutes=0),
-                                                timedelta(hours=0, minutes=10),
-                                                time1 - mid_time + timedelta(seconds=30),
-                                                timedelta(hours=0, minutes=10),
-                                                mid_time - timedelta(seconds=30),
-                                                timedelta(hours=0, minutes=20)]
-        return time_dict
\ No newline at end of file
+            for item in activities:
+                item.blocks = (item.minutes,)
+            return activities
+
+        breakdown = self.rules.breakdown
+        for item in activities:
+            item.blocks = breakdown(item.minutes)
+        return activities
+
+
+def load_plan(file_path):
+    """
+    Reads a last_info.dat style file and calculates it, like the Calculate button does.
+
+    Args:
+        file_path (str): Path of the plan file.
+
+    Returns:
+        PlanResult: The calculated plan.
+    """
+    return CalculateTimes(*load_lists(file_path)).calculate_plan()
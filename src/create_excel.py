@@ -1,10 +1,122 @@
 import os
-import pandas as pd
+import json
+import warnings
 from datetime import datetime 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from persiantools import digits
+from timeline import Timeline, format_span
 from persiantools.jdatetime import JalaliDateTime
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from functools import lru_cache
+from openpyxl.styles import Alignment, Font, PatternFill, Border, Side, NamedStyle
+
+# "stream" writes the rows straight to a write-only workbook, "pandas" goes through DataFrames
+EXCEL_BACKENDS = ("stream", "pandas")
+DEFAULT_BACKEND = "stream"
+
+# Column widths of the sheet, by column letter
+COLUMN_WIDTHS = {
+	"B": 15,  # Mental State
+	"C": 15,  # Physical State
+	"D": 15,  # Actual Time
+	"E": 15,  # Planned Time
+	"F": 15,  # Estimated Time
+	"G": 25,  # Task List
+	"H": 15,  # DateTime
+}
+
+# Rows written between two progress reports / cancel checks of the stream backend
+PROGRESS_ROWS = 500
+
+# Sheet templates are kept here as excel_template_<lang>.json, next to the other data files
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Files")
+# Bumped when the layout of the sheet changes, so older template files are rebuilt
+TEMPLATE_VERSION = 1
+# Rows of a template; every row of a sheet is styled like one of them (see ExcelTable.row_roles)
+TEMPLATE_ROLES = ("top", "header", "first", "body", "sleep", "only")
+# Templates built or loaded in this process, by (language, font, palette)
+_templates = {}
+
+
+@lru_cache(maxsize=None)
+def style_parts(font_name, palette):
+	"""
+    Builds the font, fill, border and alignment of every cell style of the sheet, once per font and palette.
+
+    The style objects are shared by all workbooks (and export threads); only the NamedStyle
+    wrappers are per workbook, see StyleRegistry.
+
+    Args:
+        font_name (str): Font of every cell.
+        palette (tuple): Sorted (key, color) items of ExcelTable.palette_color.
+
+    Returns:
+        dict: Keyword arguments of NamedStyle by style name ("plan_<kind>" or "plan_<kind>_<border>").
+    """
+	palette = dict(palette)
+	side = Side(style='medium', color=palette["border"])
+	alignment = Alignment(horizontal="center", vertical="center")
+	borders = {
+		# Same as the workbook's default border, so unboxed cells keep border 0
+		None: Border(left=Side(), right=Side(), top=Side(), bottom=Side(), diagonal=Side()),
+		'full': Border(top=side, left=side, right=side, bottom=side),
+		'bottom_left': Border(bottom=side, left=side),
+		'bottom_right': Border(bottom=side, right=side),
+		'bottom': Border(bottom=side),
+		'left': Border(left=side),
+		'right': Border(right=side),
+	}
+	# (font, fill) of each kind of cell
+	kinds = {
+		'cell': (Font(name=font_name, size=11, color="000000"), PatternFill()),
+		'header': (Font(name=font_name, color="FFFFFF", bold=True),
+		           PatternFill(start_color=palette["header"], end_color=palette["header"], fill_type="solid")),
+		'name': (Font(name=font_name, color="FFFFFF", bold=True),
+		         PatternFill(start_color="000000", end_color="000000", fill_type="solid")),
+		'sleep': (Font(name=font_name, size=11, color="FFFFFF"),
+		          PatternFill(start_color=palette['sleep'], end_color=palette['sleep'], fill_type="solid")),
+		'date': (Font(name=font_name, size=11, color="FFFFFF", bold=True),
+		         PatternFill(start_color=palette['date'], end_color=palette['date'], fill_type="solid")),
+	}
+	return {StyleRegistry.style_name(kind, border): {'font': font, 'fill': fill, 'border': side_border, 'alignment': alignment}
+	        for kind, (font, fill) in kinds.items() for border, side_border in borders.items()}
+
+
+class StyleRegistry:
+	"""
+    Named cell styles of one workbook.
+
+    A NamedStyle is added to the workbook the first time a cell uses it, so the styles part
+    of the file only holds the styles of the sheet, and a cell then takes a whole style by
+    name instead of four style objects that openpyxl has to hash and look up one by one.
+
+    Attributes:
+        wb (Workbook): The workbook the styles are added to.
+        parts (dict): style_parts() of the table's font and palette.
+        added (set): Names of the styles already in the workbook.
+    """
+	def __init__(self, wb, parts):
+		self.wb = wb
+		self.parts = parts
+		self.added = set()
+
+	@staticmethod
+	def style_name(kind, border=None):
+		return f"plan_{kind}_{border}" if border else f"plan_{kind}"
+
+	def use(self, kind, border=None):
+		# Name of the style, added to the workbook on first use
+		name = self.style_name(kind, border)
+		if name not in self.added:
+			self.wb.add_named_style(NamedStyle(name=name, **self.parts[name]))
+			self.added.add(name)
+		return name
+
+
+class ExportCancelled(Exception):
+	"""Raised by ExcelTable.create_excel() when its cancel event is set; no file is written."""
+
 
 class ExcelTable:
 	"""
@@ -15,47 +127,51 @@ class ExcelTable:
         data (list): List of activity entries (each entry is a list of estimated time and activity name).
         language (str): Language code ("Fa" for Persian, "En" for English).
         excel_path (str): Path to the output Excel file.
+        states_columns (list) / states_rows (list): Header and rows of the state table.
+        data_columns (list) / data_rows (list): Header and rows of the activity table, the Sleep row last.
     """
-	def __init__(self, data, lang="Fa", file_path=None):
+	def __init__(self, data, lang="Fa", file_path=None, planned_times=None):
 		"""
-        Initializes the ExcelTable object, builds internal DataFrames based on input data and language.
+        Initializes the ExcelTable object, builds the header and rows of both tables based on input data and language.
 
         Args:
             data (list): List of [estimated_time, activity_name] entries.
             lang (str): Language code ("Fa" or "En").
             file_path (str or None): Optional directory to save the Excel file. If None, uses current directory.
+            planned_times (list or None): Optional "HH:MM - HH:MM" clock time of each entry plus one for the Sleep row.
         """
 		
 		self.data = data
 		self.language = lang
 		
 		if self.language=="En":
-			self.df_states = pd.DataFrame({"Physical state":[10], "Mental state":[10]})
+			self.states_columns = ["Physical state", "Mental state"]
 		# ADD Other languages like 2 following line
 		# elif self.language=="En":
-		# 	self.df_states = pd.DataFrame({"Physical state":[10], "Mental state":[10]})
+		# 	self.states_columns = ["Physical state", "Mental state"]
 		else:
-			self.df_states = pd.DataFrame({"حالت جسمی":[10], "حالت روحی":[10]})
+			self.states_columns = ["حالت جسمی", "حالت روحی"]
+		self.states_rows = [[10, 10]]
 
-
-
-		self.df_data = pd.DataFrame()
 		real_times = [""]* len(self.data)
+		if planned_times is None:
+			planned_times = [""] * (len(self.data) + 1)
 		self.all_data = []
-		for r, t in zip(real_times,self.data):
-			self.all_data.append([r,t[1],t[0]])
+		for r, p, t in zip(real_times, planned_times, self.data):
+			self.all_data.append([r,p,t[1],t[0]])
+		sleep_time = planned_times[len(self.data)]
 
 		if self.language=="En":
-			self.df_data =pd.DataFrame(self.all_data, columns=["Real Time","Time Estimate", "Activity Name"])
-			self.df_data.loc[len(self.df_data)] = ["", "" ,"Sleep"]
+			self.data_columns = ["Real Time","Planned Time","Time Estimate", "Activity Name"]
+			self.data_rows = self.all_data + [["", sleep_time, "" ,"Sleep"]]
 		# ADD Other languages like 3 following line
 		# elif self.language=="En":
-		# 	self.df_data =pd.DataFrame(self.all_data, columns=["Real Time","Time Estimate", "Activity Name"])
-		# 	self.df_data.loc[len(self.df_data)] = ["", "" ,"Sleep"]
+		# 	self.data_columns = ["Real Time","Planned Time","Time Estimate", "Activity Name"]
+		# 	self.data_rows = self.all_data + [["", sleep_time, "" ,"Sleep"]]
 
 		else:
-			self.df_data =pd.DataFrame(self.all_data, columns=["زمان واقعی","تخمین حدودی", "لیست انجام کارها"])
-			self.df_data.loc[len(self.df_data)] = ["", "" ,"خواب"]
+			self.data_columns = ["زمان واقعی","زمان برنامه","تخمین حدودی", "لیست انجام کارها"]
+			self.data_rows = self.all_data + [["", sleep_time, "" ,"خواب"]]
 
 
 		if file_path is None:
@@ -71,142 +187,408 @@ class ExcelTable:
 		self.font_name = "Vazirmatn"
 		self.palette_color = {'sleep': "5A9BD5", 'date': "F50206", 'header': "003494", 'border': "1C4E7C"}
 
-	def create_excel(self):
+	@classmethod
+	def from_plan(cls, plan, lang="Fa", file_path=None, day_start=None, anchors=None):
+		"""
+        Builds an ExcelTable from a calculated plan (the Sleep row is added by the table itself).
+
+        Args:
+            plan (PlanResult): Result of CalculateTimes.calculate_plan().
+            lang (str): Language code ("Fa" or "En").
+            file_path (str or None): Optional directory to save the Excel file.
+            day_start (str or None): "HH:MM" start of the day, fills the Planned Time column when given.
+            anchors (dict or None): Fixed start (minutes after midnight) by index in plan.activities.
+        """
+		data, planned_times = cls.plan_rows(plan, day_start, anchors)
+		return cls(data, lang, file_path, planned_times)
+
+	@staticmethod
+	def plan_rows(plan, day_start=None, anchors=None):
+		"""
+        Works out the rows of a plan once, so the tables of several languages can share them.
+
+        Returns:
+            tuple: (data, planned_times) arguments of ExcelTable, planned_times is None without day_start.
+        """
+		data = [list(activity) for activity in plan.activities if activity[0] != 'Sleep']
+		if day_start is None:
+			return data, None
+
+		timeline = Timeline(plan, day_start, anchors)
+		clock_times = timeline.activity_texts()
+		planned_times = [clock for activity, clock in zip(plan.activities, clock_times) if activity[0] != 'Sleep']
+		sleep_times = [clock for activity, clock in zip(plan.activities, clock_times) if activity[0] == 'Sleep' and clock]
+		if sleep_times:
+			sleep_time = sleep_times[0]
+		elif plan.fits and timeline.ends:
+			# Sleep fills the rest of the day, up to the next day start
+			sleep_time = format_span(max(timeline.ends), timeline.day_start)
+		else:
+			sleep_time = ""
+		return data, planned_times + [sleep_time]
+
+	@property
+	def row_count(self):
+		# Rows of the sheet: the empty first row, the headers, then the activities and Sleep
+		return len(self.data_rows) + 2
+
+	@property
+	def df_states(self):
+		# DataFrames are only built for the pandas backend, so pandas is imported here
+		import pandas as pd
+		return pd.DataFrame(self.states_rows, columns=self.states_columns)
+
+	@property
+	def df_data(self):
+		import pandas as pd
+		return pd.DataFrame(self.data_rows, columns=self.data_columns)
+
+	def create_excel(self, backend=DEFAULT_BACKEND, progress=None, cancel=None):
 		"""
         Creates an Excel file with styled tables including:
         - Activity schedule with estimated times
         - Physical and mental state entries
         - Date, header colors, borders, and fonts
+
+        Args:
+            backend (str): "stream" (default) or "pandas", see EXCEL_BACKENDS. Both write the same sheet.
+            progress (callable or None): Called with the number of rows written so far (up to row_count).
+            cancel (threading.Event or None): Stops the export when set.
+
+        Raises:
+            ExportCancelled: If cancel was set before the file was saved.
         """
+		if backend == "stream":
+			self.stream_excel(progress, cancel)
+		elif backend == "pandas":
+			self.pandas_excel(progress, cancel)
+		else:
+			raise ValueError(f"Unknown Excel backend '{backend}'. Please use one of: {', '.join(EXCEL_BACKENDS)}")
+		print(f"Excel file '{self.excel_path}' created successfully with a built-in table style!")
+
+	def check_cancel(self, cancel):
+		if cancel is not None and cancel.is_set():
+			raise ExportCancelled(f"Export of '{self.excel_path}' was cancelled")
+
+	def stream_excel(self, progress=None, cancel=None):
+		"""
+        Writes the sheet row by row to a write-only workbook, without pandas.
+
+        Cells are created already styled and are flushed to the file as they are appended,
+        so memory stays flat for long plans. The workbook is saved once.
+        """
+		wb = Workbook(write_only=True)
+		ws = wb.create_sheet("Sheet1")
+		try:
+			self.write_sheet(ws, self.cell_styles(wb), progress=progress, cancel=cancel)
+		except ExportCancelled:
+			# Finish the sheet's temporary file so nothing is left half written
+			ws.close()
+			raise
+
+		wb.save(self.excel_path)
+		if progress is not None:
+			progress(self.row_count)
+
+	def write_sheet(self, ws, styles, table_suffix="", progress=None, cancel=None):
+		"""
+        Appends the styled rows and tables of the plan to a write-only worksheet.
+
+        Args:
+            ws (WriteOnlyWorksheet): An empty sheet of a write-only workbook.
+            styles (StyleRegistry): Named styles of the sheet's workbook (shared by all its sheets).
+            table_suffix (str): Appended to the table names, which must be unique in a workbook.
+            progress (callable or None): Called with the number of rows appended so far.
+            cancel (threading.Event or None): Stops the sheet when set.
+
+        Raises:
+            ExportCancelled: If cancel was set.
+        """
+		template = self.template()
+		for column, width in template["widths"].items():
+			ws.column_dimensions[column].width = width
+
+		with warnings.catch_warnings():
+			# openpyxl always warns in write-only mode; tables() already declares the columns
+			warnings.simplefilter("ignore", UserWarning)
+			for table in self.tables(2, table_suffix):
+				ws.add_table(table)
+
+		# One row of styled cells per role, refilled for every row of that role: the writer
+		# serializes the cells as soon as the row is appended, so they can be reused
+		role_cells = {}
+		for role, styles_row in template["rows"].items():
+			role_cells[role] = [WriteOnlyCell(ws) for _ in styles_row]
+			for cell, (kind, border) in zip(role_cells[role], styles_row):
+				cell.style = styles.use(kind, border)
+
+		# Row 1 is empty, the tables start at column B (states) and D (activities)
+		rows = [[None] * 7]
+		rows.append([None] + template["states_columns"] + template["data_columns"])
+		for index, data_row in enumerate(self.data_rows):
+			states_row = self.states_rows[index] if index < len(self.states_rows) else [None] * len(self.states_columns)
+			rows.append([None] + list(states_row) + list(data_row))
+
+		for row, (values, role) in enumerate(zip(rows, self.row_roles()), 1):
+			cells = role_cells[role]
+			for cell, value in zip(cells, values):
+				cell.value = value
+			if role == "header":
+				cells = cells + [self.date_cell(WriteOnlyCell(ws), styles)]
+			ws.append(cells)
+			if row % PROGRESS_ROWS == 0:
+				self.check_cancel(cancel)
+				if progress is not None:
+					progress(row)
+		self.check_cancel(cancel)
+
+	def pandas_excel(self, progress=None, cancel=None):
+		"""
+        Writes the sheet through pandas DataFrames and an openpyxl workbook in memory.
+
+        Every cell is styled in a single pass and the workbook is written to disk once,
+        when the writer is closed. Progress is only reported at the end.
+        """
+		import pandas as pd
+		self.check_cancel(cancel)
+		df_data, df_states = self.df_data, self.df_states
 		with pd.ExcelWriter(self.excel_path, engine="openpyxl") as writer:
 
-			self.df_data.to_excel(writer, index=False, sheet_name="Sheet1", startrow=1, startcol=3)
-			self.df_states.to_excel(writer, index=False, sheet_name="Sheet1", startrow=1, startcol=1)
+			df_data.to_excel(writer, index=False, sheet_name="Sheet1", startrow=1, startcol=3)
+			df_states.to_excel(writer, index=False, sheet_name="Sheet1", startrow=1, startcol=1)
 
 			wb = writer.book
 			ws = wb.active
 
 			# Set column widths
-			ws.column_dimensions["B"].width = 15  # Mental State
-			ws.column_dimensions["C"].width = 15  # Estimated Time
-			ws.column_dimensions["D"].width = 15  # Actual Time
-			ws.column_dimensions["E"].width = 15  # Task List
-			ws.column_dimensions["F"].width = 25  # Task List
-			ws.column_dimensions["G"].width = 15  # DateTime
+			for column, width in COLUMN_WIDTHS.items():
+				ws.column_dimensions[column].width = width
 
 			row_start = 2
-			table1 = Table(displayName="Table1", ref=f"B{row_start}:C{self.df_states.shape[1]+1}")
-			table2 = Table(displayName="Table2", ref=f"D{row_start}:F{self.df_data.shape[0]+1}")
+			for table in self.tables(row_start):
+				ws.add_table(table)
 
+			boxes = self.table_boxes(row_start)
+			styles = self.cell_styles(wb)
 
-			# Center-align all cells and apply font
 			for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
 				for cell in row:
-					cell.alignment = Alignment(horizontal="center", vertical="center")
-					cell.font = Font(name=self.font_name,size=11, color="000000")
-
-
-			# Set date cell (Persian date, red background)
-			date_cell = ws[f"G{row_start}"]
-			if self.language == "En":
-				date_cell.value = datetime.now().strftime('%Y.%m.%d') 
-			else:
-				date_cell.value = digits.en_to_fa(JalaliDateTime.now().strftime('%Y.%m.%d'))
-			# date_cell.value = digits.en_to_fa(JalaliDateTime.now().strftime('%Y.%m.%d'))
-			date_cell.fill = PatternFill(start_color=self.palette_color['date'], end_color=self.palette_color['date'], fill_type="solid")
-			date_cell.border = Border(top=Side(style='medium', color=self.palette_color["border"]),
-											left=Side(style='medium', color=self.palette_color["border"]),
-											right=Side(style='medium', color=self.palette_color["border"]),
-											bottom=Side(style='medium', color=self.palette_color["border"]))
-			date_cell.font = Font(name=self.font_name,size=11 ,color="FFFFFF", bold=True)
-			date_cell.alignment = Alignment(horizontal="center", vertical="center")
+					self.style_cell(cell, cell.row, cell.column, boxes, styles, row_start)
 
-			# Name cell formatting (black background)
-			name_cell = ws[f"F{row_start}"]
-			name_cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-			name_cell.font = Font(name=self.font_name,color="FFFFFF", bold=True)
-			name_cell.alignment = Alignment(horizontal="center", vertical="center")
+			self.date_cell(ws[f"H{row_start}"], styles)
+		if progress is not None:
+			progress(self.row_count)
 
-			# Header styling
-			header_fill = PatternFill(start_color=self.palette_color["header"], end_color=self.palette_color["header"], fill_type="solid")
-			header_font = Font(name=self.font_name,color="FFFFFF", bold=True)
-			
-			for cell in ws[f"B{row_start}:E{row_start}"][0]:
-				cell.fill = header_fill
-				cell.font = header_font
-
-			# Table style
-			style = TableStyleInfo(
-				name="TableStyleMedium2",
-				showFirstColumn=False,
-				showLastColumn=False,
-				showRowStripes=True,
-				showColumnStripes=False,
-			)
-			table1.tableStyleInfo = style
-			table2.tableStyleInfo = style
-
-			ws.add_table(table1)
-			ws.add_table(table2)
-			wb.save(self.excel_path)
-
-			# Draw borders for both tables
-			min_col = 2
-			max_row = self.df_states.shape[0] + row_start  
-			max_col = len(self.df_states.columns) + min_col -1
-			self.border_table(ws,row_start, min_col, max_row, max_col, False)
-			
-			min_col = 4
-			max_row = self.df_data.shape[0] + row_start
-			max_col = len(self.df_data.columns)+min_col-1
-			self.border_table(ws,row_start, min_col, max_row, max_col, True)
-
-			wb.save(self.excel_path)
-
-			# Remove auto filters for compatibility
-			table1.autoFilter = None    
-			table2.autoFilter = None    
-
-			wb.save(self.excel_path)
-			print(f"Excel file '{self.excel_path}' created successfully with a built-in table style!")
-
-	def border_table (self, ws, min_row,min_col, max_row, max_col, has_sleep):
+	def tables(self, row_start, suffix=""):
 		"""
-        Applies borders (and optionally sleep row coloring) to a table area in the worksheet.
+        Builds the two styled tables of the sheet (states, then activities).
+
+        Columns are declared up front, so openpyxl adds no auto filter when it writes the
+        tables (auto filters are left out for compatibility).
 
         Args:
-            ws (Worksheet): The openpyxl worksheet object.
-            min_row (int): Starting row of the table.
-            min_col (int): Starting column of the table.
-            max_row (int): Ending row of the table.
-            max_col (int): Ending column of the table.
-            has_sleep (bool): Whether the last row is a sleep row and needs coloring.
+            row_start (int): Row of the table headers.
+            suffix (str): Appended to "Table1" / "Table2" (names are unique per workbook).
+
+        Returns:
+            list: The openpyxl Table objects.
+        """
+		table1 = Table(displayName=f"Table1{suffix}", ref=f"B{row_start}:C{len(self.states_columns)+1}")
+		table2 = Table(displayName=f"Table2{suffix}", ref=f"D{row_start}:G{len(self.data_rows)+1}")
+
+		# Table style
+		style = TableStyleInfo(
+			name="TableStyleMedium2",
+			showFirstColumn=False,
+			showLastColumn=False,
+			showRowStripes=True,
+			showColumnStripes=False,
+		)
+		for table, headers, min_col in ((table1, self.states_columns, 2), (table2, self.data_columns, 4)):
+			table.tableStyleInfo = style
+			table.tableColumns = [TableColumn(id=col, name=str(header)) for col, header in enumerate(headers, min_col)]
+		return [table1, table2]
+
+	def table_boxes(self, row_start, data_count=None):
+		# Border boxes of both tables: (min_row, min_col, max_row, max_col, has_sleep),
+		# for data_count activity rows (the rows of this table when None)
+		if data_count is None:
+			data_count = len(self.data_rows)
+		return [
+			(row_start, 2, len(self.states_rows) + row_start, len(self.states_columns) + 1, False),
+			(row_start, 4, data_count + row_start, len(self.data_columns) + 3, True),
+		]
+
+	def row_roles(self):
+		# Template row of each row of the sheet: the empty row, the headers, then the activities and Sleep
+		yield "top"
+		yield "header"
+		if len(self.data_rows) == 1:
+			# Only the Sleep row, on the row of the state values
+			yield "only"
+			return
+		yield "first"
+		for _ in range(len(self.data_rows) - 2):
+			yield "body"
+		yield "sleep"
+
+	def template(self):
+		"""
+        Styled skeleton of the sheet in this table's language, shared by every export.
+
+        Built once per language, font and palette, then kept in memory and in
+        Files/excel_template_<lang>.json, so an export only fills in the rows.
+
+        Returns:
+            dict: The template, see build_template().
+        """
+		key = (self.language, self.font_name, tuple(sorted(self.palette_color.items())))
+		template = _templates.get(key)
+		if template is None:
+			template = self.load_template()
+			if template is None:
+				template = self.build_template()
+				self.save_template(template)
+			_templates[key] = template
+		return template
+
+	def template_path(self):
+		return os.path.join(TEMPLATE_DIR, f"excel_template_{self.language}.json")
+
+	def build_template(self):
+		"""
+        Works out the skeleton of the sheet: headers, column widths and the (kind, border)
+        style of every cell of each row role of TEMPLATE_ROLES.
+
+        The roles are taken from a sheet of three activity rows (every role but "only") and
+        from a sheet of the Sleep row alone ("only").
+
+        Returns:
+            dict: version, language, font, palette, states_columns, data_columns, widths and
+                  rows ([kind, border] of each column by role).
+        """
+		row_start = 2
+		columns = 1 + len(self.states_columns) + len(self.data_columns)
+		rows = {}
+		for data_count, roles in ((3, ("top", "header", "first", "body", "sleep")), (1, (None, None, "only"))):
+			boxes = self.table_boxes(row_start, data_count)
+			for row, role in enumerate(roles, 1):
+				if role is not None:
+					rows[role] = [list(self.cell_style(row, col, boxes, row_start)) for col in range(1, columns + 1)]
+		return {
+			"version": TEMPLATE_VERSION,
+			"language": self.language,
+			"font": self.font_name,
+			"palette": self.palette_color,
+			"states_columns": self.states_columns,
+			"data_columns": self.data_columns,
+			"widths": COLUMN_WIDTHS,
+			"rows": rows,
+		}
+
+	def load_template(self):
+		# Template file of the language, None when it is missing, unreadable or made for another layout
+		try:
+			with open(self.template_path(), encoding="utf-8") as f:
+				template = json.load(f)
+		except (OSError, ValueError):
+			return None
+		expected = {"version": TEMPLATE_VERSION, "language": self.language, "font": self.font_name,
+		            "palette": self.palette_color, "states_columns": self.states_columns,
+		            "data_columns": self.data_columns}
+		if not isinstance(template, dict) or any(template.get(k) != v for k, v in expected.items()):
+			return None
+		if sorted(template.get("rows", {})) != sorted(TEMPLATE_ROLES):
+			return None
+		return template
+
+	def save_template(self, template):
+		# Written to a temporary file first, so a parallel export never reads half a template
+		path = self.template_path()
+		temp_path = f"{path}.{os.getpid()}.tmp"
+		try:
+			with open(temp_path, "w", encoding="utf-8") as f:
+				json.dump(template, f, ensure_ascii=False, indent=1)
+			os.replace(temp_path, path)
+		except OSError:
+			# A read-only install still exports, with the template kept in memory only
+			if os.path.exists(temp_path):
+				os.remove(temp_path)
+
+	def date_cell(self, date_cell, styles):
+		# Set date cell (Persian date, red background)
+		if self.language == "En":
+			date_cell.value = datetime.now().strftime('%Y.%m.%d') 
+		else:
+			date_cell.value = digits.en_to_fa(JalaliDateTime.now().strftime('%Y.%m.%d'))
+		date_cell.style = styles.use('date', 'full')
+		return date_cell
+
+	def cell_styles(self, wb):
+		"""
+        Returns the style registry of a workbook, built on the shared style objects of the table's font and palette.
+
+        Returns:
+            StyleRegistry: Named styles used by style_cell() and date_cell().
+        """
+		return StyleRegistry(wb, style_parts(self.font_name, tuple(sorted(self.palette_color.items()))))
+
+	def style_cell(self, cell, row, col, boxes, styles, row_start):
+		"""
+        Sets the named style (alignment, font, fill and border) of one cell.
+
+        Args:
+            cell (Cell): The openpyxl cell (a WriteOnlyCell has no position yet).
+            row (int): Row of the cell.
+            col (int): Column of the cell.
+            boxes (list): (min_row, min_col, max_row, max_col, has_sleep) of each table.
+            styles (StyleRegistry): Named styles from cell_styles().
+            row_start (int): Row of the table headers.
+        """
+		cell.style = styles.use(*self.cell_style(row, col, boxes, row_start))
+
+	def cell_style(self, row, col, boxes, row_start):
+		"""
+        Kind and border of the style of one cell, see style_parts().
+
+        Returns:
+            tuple: (kind, border name or None).
+        """
+		kind, border = 'cell', None
+		if row == row_start and col == 7:
+			# Name cell formatting (black background)
+			kind = 'name'
+		elif row == row_start and 2 <= col <= 6:
+			# Header styling
+			kind = 'header'
+
+		for min_row, min_col, max_row, max_col, has_sleep in boxes:
+			if not (min_row <= row <= max_row and min_col <= col <= max_col):
+				continue
+			border = self.border_at(row, col, min_row, min_col, max_row, max_col)
+			if has_sleep and row == max_row and row != min_row:
+				# The last row of the plan is the Sleep row
+				kind = 'sleep'
+		return kind, border
+
+	@staticmethod
+	def border_at(row, col, min_row, min_col, max_row, max_col):
+		"""
+        Name of the border a cell gets inside a table area (the header row is fully boxed).
+
+        Returns:
+            str or None: Border name of style_parts(), None for inner cells.
         """
-		for row in range(min_row, max_row + 1):
-			for col in range(min_col, max_col + 1):
-				cell = ws.cell(row=row, column=col)
-				# Top border for header
-				if row == min_row: 
-					cell.border = Border(top=Side(style='medium', color=self.palette_color["border"]),
-										left=Side(style='medium', color=self.palette_color["border"]),
-										right=Side(style='medium', color=self.palette_color["border"]),
-										bottom=Side(style='medium', color=self.palette_color["border"]))
-				# Bottom border and fill for last row
-				elif row == max_row:
-					if col == min_col:
-						cell.border = Border(bottom=Side(style='medium', color=self.palette_color["border"]),
-											left=Side(style='medium', color=self.palette_color["border"]))
-					elif col == max_col:
-						cell.border = Border(bottom=Side(style='medium', color=self.palette_color["border"]),
-											right=Side(style='medium', color=self.palette_color["border"]))
-					else:
-						cell.border = Border(bottom=Side(style='medium', color=self.palette_color["border"]))
-					if has_sleep:
-						cell.fill = PatternFill(start_color=self.palette_color['sleep'], end_color=self.palette_color['sleep'], fill_type="solid")
-						cell.font = Font(name=self.font_name, size=11, color="FFFFFF")
-				# Left border
-				elif col == min_col:
-					cell.border = Border(left=Side(style='medium', color=self.palette_color["border"]))
-				# Right border
-				elif col == max_col:
-					cell.border = Border(right=Side(style='medium', color=self.palette_color["border"]))
+		if row == min_row:
+			return 'full'
+		if row == max_row:
+			if col == min_col:
+				return 'bottom_left'
+			if col == max_col:
+				return 'bottom_right'
+			return 'bottom'
+		if col == min_col:
+			return 'left'
+		if col == max_col:
+			return 'right'
+		return None
@@ -0,0 +1,63 @@
+import re
+
+# "H:MM" (" 2 : 05 " too), "1h30m" / "2h" / "45m", or plain minutes "90"
+DURATION_PATTERN = re.compile(
+    r"\s*(?:(\d+)\s*:\s*(\d+)"
+    r"|(?=\d+\s*[hm])(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?"
+    r"|(\d+))\s*",
+    re.IGNORECASE,
+)
+
+
+def parse_duration(text):
+    """
+    Converts one duration into minutes: "H:MM", "1h30m" / "2h" / "45m" or plain minutes.
+
+    Args:
+        text (str): The duration text.
+
+    Returns:
+        int or None: Minutes, None when the text is not a duration (no exception is raised).
+    """
+    # Plain "H:MM" first without the regex, it is what the tables hold
+    hours, sep, minutes = text.partition(":")
+    if sep and hours.isdecimal() and minutes.isdecimal():
+        return int(hours) * 60 + int(minutes)
+
+    match = DURATION_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    clock_hours, clock_minutes, hours, minutes, plain = match.groups()
+    if clock_hours is not None:
+        return int(clock_hours) * 60 + int(clock_minutes)
+    if plain is not None:
+        return int(plain)
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def duration_error(text):
+    # Message of a text that parse_duration() rejected
+    if not text.strip():
+        return "Duration is empty"
+    return f"Invalid duration '{text}'. Please use h:mm, 1h30m or a number of minutes"
+
+
+def parse_durations(texts):
+    """
+    Converts a batch of durations, collecting the bad ones instead of raising.
+
+    Args:
+        texts (iterable): Duration texts.
+
+    Returns:
+        tuple: (minutes, errors) where minutes has an int or None for every text and
+               errors is a list of (position, message) for the None entries.
+    """
+    values = []
+    errors = []
+    for position, text in enumerate(texts):
+        value = parse_duration(text)
+        if value is None:
+            errors.append((position, duration_error(text)))
+        values.append(value)
+    return values, errors
@@ -0,0 +1,172 @@
+import os
+import re
+import warnings
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from calculate_times import format_hhmm
+from persiantools.jdatetime import JalaliDateTime
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from create_excel import ExcelTable, ExportCancelled
+
+# Characters Excel does not allow in sheet names, and their maximum length
+INVALID_TITLE_CHARS = re.compile(r"[\[\]:*?/\\]")
+MAX_TITLE_LENGTH = 31
+
+SUMMARY_WIDTHS = {"B": 25, "C": 18, "D": 18, "E": 15, "F": 15, "G": 12}
+
+
+def sheet_title(title, used):
+	"""
+    Makes a valid, unique sheet name out of a plan title.
+
+    Args:
+        title (str): Wanted name.
+        used (set): Names already taken (lower case, Excel compares them case-insensitively).
+
+    Returns:
+        str: The sheet name, also added to used.
+    """
+	base = INVALID_TITLE_CHARS.sub("_", str(title)).strip("' ") or "Plan"
+	base = base[:MAX_TITLE_LENGTH]
+	name, number = base, 2
+	while name.lower() in used:
+		ending = f" ({number})"
+		name = base[:MAX_TITLE_LENGTH - len(ending)] + ending
+		number += 1
+	used.add(name.lower())
+	return name
+
+
+class ExcelBook:
+	"""
+    Writes several plans (days, people, ...) into one workbook: a summary sheet first, then one
+    sheet per plan laid out like the sheet of ExcelTable.
+
+    The workbook is write-only, its named styles are shared by every sheet and it is saved once.
+
+    Attributes:
+        language (str): Language code ("Fa" or "En").
+        excel_path (str): Path to the output Excel file.
+        sheets (list): (title, plan, ExcelTable) of each plan, in sheet order.
+    """
+	def __init__(self, lang="Fa", file_path=None, file_name=None):
+		"""
+        Args:
+            lang (str): Language code ("Fa" or "En").
+            file_path (str or None): Directory of the Excel file (the directory of this module when None).
+            file_name (str or None): File name, "plans_<date>_<lang>.xlsx" when None.
+        """
+		self.language = lang
+		self.sheets = []
+
+		if file_path is None:
+			file_path = os.path.dirname(os.path.realpath(__file__))
+		if file_name is None:
+			if self.language == "En":
+				date_str = datetime.now().strftime('%Y-%m-%d')
+			else:
+				date_str = JalaliDateTime.now().strftime('%Y-%m-%d')
+			file_name = f"plans_{date_str}_{self.language}.xlsx"
+		self.excel_path = os.path.join(file_path, file_name)
+
+	def add_plan(self, title, plan, day_start=None, anchors=None):
+		"""
+        Adds a plan as the next sheet.
+
+        Args:
+            title (str): Sheet name (made valid and unique when the workbook is written).
+            plan (PlanResult): Result of CalculateTimes.calculate_plan().
+            day_start (str or None): "HH:MM" start of the day, fills the Planned Time column when given.
+            anchors (dict or None): Fixed start (minutes after midnight) by index in plan.activities.
+        """
+		table = ExcelTable.from_plan(plan, self.language, os.path.dirname(self.excel_path), day_start, anchors)
+		self.sheets.append((title, plan, table))
+
+	@property
+	def row_count(self):
+		# Rows of every sheet, the summary included
+		return len(self.sheets) + 2 + sum(table.row_count for _, _, table in self.sheets)
+
+	def summary_rows(self, titles):
+		# Header and one row of totals per plan
+		if self.language == "En":
+			header = ["Plan", "Time With Rest", "Time Without Rest", "Total Time", "Reminder Time", "Status"]
+			status = {True: "Yes", False: "No"}
+		else:
+			header = ["برنامه", "زمان با استراحت", "زمان بدون استراحت", "زمان کل", "زمان باقی‌مانده", "وضعیت"]
+			status = {True: "بله", False: "خیر"}
+		rows = [[title, format_hhmm(plan.total_with_rest), format_hhmm(plan.total_without_rest),
+		         format_hhmm(plan.total), format_hhmm(plan.remaining), status[plan.fits]]
+		        for title, (_, plan, _) in zip(titles, self.sheets)]
+		return header, rows
+
+	def write_summary(self, ws, styles, titles):
+		# Summary table at B2, styled and boxed like the plan tables
+		for column, width in SUMMARY_WIDTHS.items():
+			ws.column_dimensions[column].width = width
+		header, rows = self.summary_rows(titles)
+		row_start, min_col = 2, 2
+		max_row, max_col = row_start + len(rows), min_col + len(header) - 1
+
+		table = Table(displayName="Summary", ref=f"B{row_start}:G{max_row}")
+		table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium2", showRowStripes=True)
+		table.tableColumns = [TableColumn(id=col, name=name) for col, name in enumerate(header, min_col)]
+		with warnings.catch_warnings():
+			# openpyxl always warns in write-only mode; the columns are declared above
+			warnings.simplefilter("ignore", UserWarning)
+			ws.add_table(table)
+
+		ws.append([])
+		for row, values in enumerate([header] + rows, row_start):
+			cells = [None]
+			for col, value in enumerate(values, min_col):
+				cell = WriteOnlyCell(ws, value)
+				border = ExcelTable.border_at(row, col, row_start, min_col, max_row, max_col)
+				cell.style = styles.use('header' if row == row_start else 'cell', border)
+				cells.append(cell)
+			ws.append(cells)
+
+	def create_excel(self, progress=None, cancel=None):
+		"""
+        Writes the summary and every plan sheet, then saves the workbook once.
+
+        Args:
+            progress (callable or None): Called with the number of rows written so far (up to row_count).
+            cancel (threading.Event or None): Stops the export when set.
+
+        Raises:
+            ValueError: If no plan was added.
+            ExportCancelled: If cancel was set before the file was saved.
+        """
+		if not self.sheets:
+			raise ValueError("Please add at least one plan to the workbook")
+
+		wb = Workbook(write_only=True)
+		used = set()
+		summary_title = "Summary" if self.language == "En" else "خلاصه"
+		summary = wb.create_sheet(sheet_title(summary_title, used))
+		titles = [sheet_title(title, used) for title, _, _ in self.sheets]
+		# One registry for the whole workbook, so every sheet uses the same named styles
+		styles = self.sheets[0][2].cell_styles(wb)
+
+		done = len(self.sheets) + 2
+		try:
+			self.write_summary(summary, styles, titles)
+			for index, (title, (_, _, table)) in enumerate(zip(titles, self.sheets), 1):
+				sheet_progress = None
+				if progress is not None:
+					sheet_progress = lambda rows, done=done: progress(done + rows)
+				table.write_sheet(wb.create_sheet(title), styles, f"_{index}", sheet_progress, cancel)
+				done += table.row_count
+		except ExportCancelled:
+			# Finish the temporary files of the sheets so nothing is left half written
+			for ws in wb.worksheets:
+				if not ws.closed:
+					ws.close()
+			raise ExportCancelled(f"Export of '{self.excel_path}' was cancelled") from None
+
+		wb.save(self.excel_path)
+		if progress is not None:
+			progress(self.row_count)
+		print(f"Excel file '{self.excel_path}' created successfully with {len(self.sheets)} plan sheets!")
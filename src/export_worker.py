@@ -0,0 +1,119 @@
+import threading
+import importlib
+from functools import partial
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtWidgets import QProgressDialog
+from concurrent.futures import ThreadPoolExecutor
+
+EXPORT_LANGUAGES = ("Fa", "En")
+# Loaded on first export (or by warm_up_export), not when the GUI starts: about 0.2 s cold
+EXPORT_MODULES = ("openpyxl", "persiantools.jdatetime", "create_excel", "excel_book")
+
+
+def import_export_modules():
+    for name in EXPORT_MODULES:
+        importlib.import_module(name)
+
+
+def warm_up_export():
+    """
+    Imports the export modules on a background thread, so the first export does not wait for them.
+
+    An export started before the thread is done waits on the import lock for the module
+    being loaded, then finds it in sys.modules.
+
+    Returns:
+        threading.Thread: The started daemon thread.
+    """
+    thread = threading.Thread(target=import_export_modules, name="export-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+class ExportWorker(QThread):
+    """
+    Writes workbooks off the GUI thread, one pool thread per workbook (usually one per language).
+
+    A workbook is any object with excel_path, row_count and create_excel(progress=, cancel=):
+    an ExcelTable or an ExcelBook. Progress is the number of sheet rows written over all
+    workbooks, out of total.
+
+    Signals:
+        progress (int): Rows written so far.
+        exported (list): Paths of the written files, when every workbook is done.
+        cancelled: The export was stopped by cancel().
+        failed (str): Message of the error that stopped the export.
+
+    Attributes:
+        tables (list): The workbooks to write.
+        total (int): Rows to write over all workbooks.
+    """
+    progress = pyqtSignal(int)
+    exported = pyqtSignal(list)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, tables, parent=None):
+        super().__init__(parent)
+        self.tables = list(tables)
+        self.total = sum(table.row_count for table in self.tables)
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.written = [0] * len(self.tables)
+
+    @classmethod
+    def from_plan(cls, plan, directory, day_start=None, anchors=None, languages=EXPORT_LANGUAGES, parent=None):
+        """Worker for the single-sheet workbooks of one plan; the rows and clock times are worked out once for all languages."""
+        # Not imported at module level, see EXPORT_MODULES
+        from create_excel import ExcelTable
+        data, planned_times = ExcelTable.plan_rows(plan, day_start, anchors)
+        return cls([ExcelTable(data, lang, directory, planned_times) for lang in languages], parent)
+
+    def progress_dialog(self, parent):
+        """
+        Creates a window-modal progress dialog that follows the worker; its Cancel button cancels it.
+
+        Returns:
+            QProgressDialog: The shown dialog (closing it is left to the caller).
+        """
+        dialog = QProgressDialog("Exporting Excel files...", "Cancel", 0, self.total, parent)
+        dialog.setWindowTitle("Export Excel")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.setAutoReset(False)
+        dialog.setValue(0)
+        dialog.canceled.connect(self.cancel)
+        self.progress.connect(dialog.setValue)
+        return dialog
+
+    def cancel(self):
+        # Thread safe, the pool threads check the event between batches of rows
+        self.stop_event.set()
+
+    def report(self, index, rows):
+        # Called from the pool threads; the signal is queued to the GUI thread
+        with self.lock:
+            self.written[index] = rows
+            done = sum(self.written)
+        self.progress.emit(done)
+
+    def run(self):
+        from create_excel import ExportCancelled
+        if not self.tables:
+            self.exported.emit([])
+            return
+        with ThreadPoolExecutor(max_workers=len(self.tables)) as executor:
+            futures = [executor.submit(table.create_excel, progress=partial(self.report, index), cancel=self.stop_event)
+                       for index, table in enumerate(self.tables)]
+            try:
+                for future in futures:
+                    future.result()
+            except ExportCancelled:
+                self.cancelled.emit()
+                return
+            except Exception as e:
+                # Stop the other languages as well
+                self.stop_event.set()
+                self.failed.emit(str(e))
+                return
+        self.exported.emit([table.excel_path for table in self.tables])
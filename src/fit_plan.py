@@ -0,0 +1,165 @@
+import numpy as np
+from dataclasses import dataclass
+from calculate_times import CalculateTimes, DAY_SECONDS
+from rest_rules import TABLE_MINUTES
+
+DAY_MINUTES = DAY_SECONDS // 60
+
+# Activities that are never shortened unless asked otherwise
+DEFAULT_KEEP = ('Sleep',)
+
+
+@dataclass(frozen=True)
+class FitSuggestion:
+    """
+    Proposed duration of one activity of an over-budget plan.
+
+    Attributes:
+        name (str): Activity name.
+        minutes (int): Planned duration in minutes.
+        suggested (int): Proposed duration in minutes (0 to drop the activity).
+        has_rest (bool): Whether the activity gets rest times.
+    """
+    name: str
+    minutes: int
+    suggested: int
+    has_rest: bool
+
+    @property
+    def changed(self):
+        return self.suggested != self.minutes
+
+    @property
+    def duration(self):
+        # Proposed duration as "H:MM", like the table cells
+        return f"{self.suggested // 60}:{self.suggested % 60:02}"
+
+
+def rest_cost_index(rules, limit):
+    """
+    Rest minutes that add_rest_times adds to a task of each duration (split_long_tasks included).
+
+    The index is made non-decreasing (a shorter task is charged the rest of the longest
+    shorter-or-equal task), which only overestimates the cost, so every proposal still
+    fits; with the default rules the rest already grows with the duration.
+
+    Args:
+        rules (RestRules): Rest policy.
+        limit (int): Size of the index (longest duration + 1).
+
+    Returns:
+        numpy.ndarray: Rest minutes for durations 0 .. limit - 1.
+    """
+    rest = np.zeros(limit, dtype=np.int64)
+    # Durations of a day come straight from the rule set's table
+    covered = min(limit, TABLE_MINUTES)
+    rest[:covered] = np.array(rules.planned_table[:covered], dtype=np.int64) - np.arange(covered)
+    for minutes in range(covered, limit):
+        rest[minutes] = rules.planned_minutes(minutes) - minutes
+    # A dropped activity takes no rest
+    rest[0] = 0
+    return np.maximum.accumulate(rest)
+
+
+def rest_segments(rest):
+    """
+    Splits a rest_cost_index() into runs of durations with the same rest.
+
+    Returns:
+        tuple: (lo, hi, rest) arrays of the runs, longest durations first.
+    """
+    changes = np.flatnonzero(np.diff(rest)) + 1
+    lo = np.concatenate(([0], changes))
+    hi = np.concatenate((changes - 1, [len(rest) - 1]))
+    return lo[::-1], hi[::-1], rest[lo][::-1]
+
+
+def fit_durations(items, rest, budget=DAY_MINUTES):
+    """
+    Finds the durations that keep the most work minutes with the total (rest included) within budget.
+
+    Bounded knapsack over the minutes of the budget. best[b] is the most work that fits in b
+    minutes. Feasibility is monotone: once the kept items fit in some budget, they fit in
+    every larger one. From that first feasible budget on, one more minute adds at most one
+    work minute (any flexible item can give one back), so best[b] - b never increases there.
+    Inside a run of durations with the same rest, one more work minute costs exactly one
+    more minute, so the best duration of a run is the longest one whose previous budget is
+    still feasible: found in O(1) per budget minute instead of trying every duration. Each
+    item costs O(runs * budget) numpy work.
+
+    Args:
+        items (list): (minutes, has_rest, keep) for each activity.
+        rest (numpy.ndarray): rest_cost_index() covering the longest activity.
+        budget (int): Minutes available.
+
+    Returns:
+        list or None: Suggested minutes of each item, None if the kept activities alone do not fit.
+    """
+    no_fit = -(1 << 40)
+    budgets = np.arange(budget + 1)
+    all_lo, all_hi, all_cost = rest_segments(rest)
+    best = np.zeros(budget + 1, dtype=np.int64)
+    choices = []
+    for minutes, has_rest, keep in items:
+        if keep:
+            lo = hi = np.array([minutes])
+            cost = rest[minutes:minutes + 1] if has_rest else np.zeros(1, dtype=np.int64)
+        elif has_rest:
+            # Runs that start at or below the planned duration, the longest one cut at it
+            first = np.searchsorted(-all_lo, -minutes)
+            lo, cost = all_lo[first:], all_cost[first:]
+            hi = np.minimum(all_hi[first:], minutes)
+        else:
+            lo, hi, cost = np.zeros(1, dtype=np.int64), np.array([minutes]), np.zeros(1, dtype=np.int64)
+
+        # Budgets below the first feasible one cannot hold the items so far (kept activities)
+        first_feasible = int(np.argmax(best > no_fit // 2)) if best[budget] > no_fit // 2 else budget + 1
+        left = budgets - cost[:, None]
+        # Cheapest previous budget of each run: the longest duration that leaves a feasible budget
+        previous = np.minimum(np.maximum(left - hi[:, None], first_feasible), budget)
+        durations = left - previous
+        work = durations + best[previous]
+        work[durations < lo[:, None]] = no_fit
+        pick = work.argmax(axis=0)
+        best = work[pick, budgets]
+        choices.append(durations[pick, budgets])
+
+    if best[budget] <= no_fit // 2:
+        return None
+    suggested = []
+    remaining = budget
+    for (minutes, has_rest, _), choice in zip(reversed(items), reversed(choices)):
+        duration = int(choice[remaining])
+        suggested.append(duration)
+        remaining -= duration + (int(rest[duration]) if has_rest else 0)
+    return suggested[::-1]
+
+
+def fit_to_day(list_with_rest, list_without_rest, rules=None, budget=DAY_MINUTES, keep=DEFAULT_KEEP):
+    """
+    Proposes which activities to shorten or drop so the plan fits in one day.
+
+    Args:
+        list_with_rest (list): [name, "H:MM"] rows of activities with rest.
+        list_without_rest (list): [name, "H:MM"] rows of activities without rest.
+        rules (RestRules or None): Rest policy (Files/rest_rules.dat when None).
+        budget (int): Minutes available (24 h by default).
+        keep (tuple): Names of activities that are never shortened.
+
+    Returns:
+        list or None: FitSuggestion for each valid row, activities with rest first; None when
+                      the kept activities alone are longer than the budget.
+    """
+    calc = CalculateTimes(list_with_rest, list_without_rest, rules)
+    activities = ([(item, True) for item in calc.convert_list_to_activities(list_with_rest)] +
+                  [(item, False) for item in calc.convert_list_to_activities(list_without_rest)])
+    if not activities:
+        return []
+
+    rest = rest_cost_index(calc.rules, max(item.minutes for item, _ in activities) + 1)
+    items = [(item.minutes, has_rest, item.name in keep) for item, has_rest in activities]
+    suggested = fit_durations(items, rest, budget)
+    if suggested is None:
+        return None
+    return [FitSuggestion(item.name, item.minutes, minutes, has_rest)
+            for (item, has_rest), minutes in zip(activities, suggested)]
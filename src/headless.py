@@ -0,0 +1,273 @@
+import os
+import csv
+import sys
+import argparse
+from datetime import date
+from utils import read_last_info, sections_to_lists
+from plan_store import PlanStore, STORE_PATH
+from stream_plan import StreamingPlan
+from calculate_times import CalculateTimes, format_hhmm
+from timeline import Timeline, DEFAULT_DAY_START, anchors_from_rows
+from week_plan import plan_week, format_minutes, DEFAULT_DAYS
+from plan_export import EXPORTERS, export_plan
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Daylence command line mode (no GUI).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = commands.add_parser("plan", help="Calculate a saved plan and export the FA/EN workbooks.")
+    add_source_arguments(plan_parser, "Plan file in last_info.dat format.")
+    add_export_arguments(plan_parser)
+    plan_parser.add_argument("--fit", action="store_true",
+                             help="When the plan is longer than 24 h, print what to shorten or drop so it fits.")
+    plan_parser.add_argument("--excel-backend", default="stream", choices=["stream", "pandas"],
+                             help="Workbook writer: rows streamed by openpyxl, or pandas DataFrames (default: stream).")
+    plan_parser.add_argument("--output", help="File for every work/rest block and the totals, without the Excel libraries.")
+    plan_parser.add_argument("--format", choices=sorted(EXPORTERS),
+                             help="Format of --output (default: from its extension).")
+
+    stream_parser = commands.add_parser("stream", help="Calculate a large CSV/JSON-lines activity log in constant memory.")
+    stream_parser.add_argument("--input", required=True, help="CSV (name,duration[,section]) or JSON-lines file.")
+    stream_parser.add_argument("--output", help="CSV file for the calculated rows (only totals when omitted).")
+
+    week_parser = commands.add_parser("week", help="Distribute weekly activity targets over several days.")
+    add_source_arguments(week_parser, "Plan file in last_info.dat format; durations of activities with and without "
+                                      "breaks are weekly targets, joint activities repeat every day.")
+    week_parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help=f"Number of days (default: {DEFAULT_DAYS}).")
+    week_parser.add_argument("--day-cap", default="24:00", help="Time available per day, H:MM (default: 24:00).")
+    week_parser.add_argument("--session", help="Longest session of one activity, H:MM (default: the long task chunk).")
+    add_export_arguments(week_parser, "Directory for one workbook per language, a sheet per day (no export when omitted).")
+
+    batch_parser = commands.add_parser("batch", help="Calculate every plan file of a directory in parallel.")
+    batch_parser.add_argument("--input-dir", required=True, help="Directory of last_info.dat style plan files.")
+    batch_parser.add_argument("--pattern", default="*.dat", help="File name pattern (default: *.dat).")
+    batch_parser.add_argument("--workers", type=int, help="Number of processes (default: CPU count).")
+    add_export_arguments(batch_parser, "Directory for one workbook per language, a sheet per plan file (no export when omitted).")
+
+    history_parser = commands.add_parser("history", help="Compare estimated and real times of the exported workbooks.")
+    history_parser.add_argument("--input-dir", required=True, help="Directory of plan_<date>_<lang>.xlsx / plans_<date>_<lang>.xlsx files.")
+    history_parser.add_argument("--from", dest="start", type=date.fromisoformat, help="First day, YYYY-MM-DD (Gregorian).")
+    history_parser.add_argument("--to", dest="end", type=date.fromisoformat, help="Last day, YYYY-MM-DD (Gregorian).")
+    history_parser.add_argument("--language", choices=["Fa", "En"],
+                                help="Read only the workbooks of one language (default: the one filled in).")
+    return parser
+
+
+def add_source_arguments(parser, input_help):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help=input_help)
+    source.add_argument("--date", type=date.fromisoformat,
+                        help="Plan of a day saved by the GUI, YYYY-MM-DD (read from --store).")
+    parser.add_argument("--store", default=STORE_PATH, help="Plan store of --date (default: Files/plans.db).")
+
+
+def add_export_arguments(parser, export_help="Directory for the Excel files (no export when omitted)."):
+    parser.add_argument("--export-dir", help=export_help)
+    parser.add_argument("--languages", nargs="+", default=["Fa", "En"], choices=["Fa", "En"],
+                        help="Workbook languages to export (default: Fa En).")
+    parser.add_argument("--day-start", default=DEFAULT_DAY_START,
+                        help=f"Clock time of the first activity, HH:MM (default: {DEFAULT_DAY_START}).")
+
+
+def plan_sections(args):
+    """
+    Rows by section of the plan of a command: the file of --input, or the day of --date in the plan store.
+
+    Raises:
+        ValueError: If the store has no plan for that day.
+    """
+    if args.input:
+        return read_last_info(args.input)
+    with PlanStore(args.store) as store:
+        sections = store.load_day(args.date)
+    if sections is None:
+        raise ValueError(f"No plan saved for {args.date.isoformat()} in '{args.store}'")
+    return sections
+
+
+def plan_lists(args):
+    # Lists of the plan of the plan command (see plan_sections)
+    return sections_to_lists(plan_sections(args))
+
+
+def print_errors(errors):
+    for message in errors:
+        print(message, file=sys.stderr)
+
+
+def print_timeline(plan, day_start, anchors=None):
+    timeline = Timeline(plan, day_start, anchors)
+    for row, clock in zip(plan.activities, timeline.activity_texts()):
+        if clock:
+            print(f"{clock}  {row[0]}")
+    for first, second in timeline.conflicts:
+        print(f"Conflict: '{plan.activities[first][0]}' overlaps '{plan.activities[second][0]}'", file=sys.stderr)
+
+
+def print_summary(plan):
+    print(f"Time With Rest:          {format_hhmm(plan.total_with_rest)}")
+    print(f"Total Time Without Rest: {format_hhmm(plan.total_without_rest)}")
+    print(f"Total Time:              {format_hhmm(plan.total)}")
+    print(f"Reminder Time:           {format_hhmm(plan.remaining)}")
+    print(f"Status:                  {'Yes' if plan.fits else 'No'}")
+
+
+def print_fit(list_with_rest, list_without_rest):
+    from fit_plan import fit_to_day
+
+    suggestions = fit_to_day(list_with_rest, list_without_rest)
+    if suggestions is None:
+        print("Kept activities (Sleep) alone are longer than 24 hours.")
+        return
+    print("Suggested changes:")
+    for s in suggestions:
+        if s.changed:
+            print(f"  {s.name}: {s.minutes // 60}:{s.minutes % 60:02} -> {s.duration if s.suggested else 'Drop'}")
+
+
+def run_plan(args):
+    lists = plan_lists(args)
+    plan = CalculateTimes(*lists).calculate_plan()
+    if not plan.activities:
+        print(f"No activities found in '{args.input or args.date.isoformat()}'.", file=sys.stderr)
+        return 1
+
+    print_errors(plan.errors)
+    anchors = anchors_from_rows(*lists)
+    print_timeline(plan, args.day_start, anchors)
+    print_summary(plan)
+    if args.fit and not plan.fits:
+        print_fit(*lists)
+    if args.output:
+        export_plan(plan, args.output, args.format, args.day_start, anchors)
+    if args.export_dir:
+        # Imported here so a plain calculation does not load openpyxl
+        from create_excel import ExcelTable
+        os.makedirs(args.export_dir, exist_ok=True)
+        for lang in args.languages:
+            ExcelTable.from_plan(plan, lang, args.export_dir, args.day_start, anchors).create_excel(args.excel_backend)
+    return 0
+
+
+def run_stream(args):
+    stream = StreamingPlan.from_file(args.input)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Activity", "Subduration", "Duration", "Has Rest"])
+            for has_rest, row in stream:
+                writer.writerow([row[0], row[1].replace("\n", " "), row[2], "Yes" if has_rest else "No"])
+    else:
+        for _ in stream:
+            pass
+
+    print_errors(stream.errors)
+    if stream.errors.dropped:
+        print(f"... and {stream.errors.dropped} more skipped rows", file=sys.stderr)
+    print(f"Activities:              {stream.count}")
+    print_summary(stream)
+    return 0
+
+
+def export_book(args, plans):
+    """
+    Writes one multi-sheet workbook per language of args.languages to args.export_dir.
+
+    Args:
+        args (Namespace): Parsed arguments with export_dir, languages and day_start.
+        plans (list): (sheet title, PlanResult, anchors) of each sheet.
+    """
+    # Imported here so a plain calculation does not load openpyxl
+    from excel_book import ExcelBook
+    os.makedirs(args.export_dir, exist_ok=True)
+    for lang in args.languages:
+        book = ExcelBook(lang, args.export_dir)
+        for title, plan, anchors in plans:
+            book.add_plan(title, plan, args.day_start, anchors)
+        book.create_excel()
+
+
+def run_week(args):
+    sections = plan_sections(args)
+    rows = {key: [row for row in value if row[0].strip() and row[1].strip()] for key, value in sections.items()}
+    parse = CalculateTimes([], []).timestr_to_minutes
+    session = parse(args.session) if args.session else None
+    week = plan_week(rows['with_breaks'], rows['without_breaks'], rows['joint_activities'],
+                     args.days, parse(args.day_cap), session)
+
+    print_errors(week.errors)
+    for day, plan in enumerate(week.plans, 1):
+        names = ", ".join(row[0] for row in plan.activities)
+        print(f"Day {day}\t{format_hhmm(plan.total)}\t{format_hhmm(plan.remaining)}\t{names}")
+    for name, minutes, _ in week.unplaced:
+        print(f"Unplaced session: {name} {format_minutes(minutes)}", file=sys.stderr)
+    if args.export_dir:
+        export_book(args, [(f"Day {day}", plan, anchors_from_rows(*rows))
+                           for day, (rows, plan) in enumerate(zip(week.days, week.plans), 1)])
+    return 1 if week.unplaced else 0
+
+
+def run_batch(args):
+    from batch_planner import plan_directory
+
+    failed = 0
+    sheets = []
+    for result in plan_directory(args.input_dir, args.pattern, args.workers):
+        print_errors(result.errors)
+        if result.plan is None:
+            failed += 1
+            continue
+        status = "Yes" if result.plan.fits else "No"
+        print(f"{os.path.basename(result.path)}\t{format_hhmm(result.plan.total)}\t{format_hhmm(result.plan.remaining)}\t{status}")
+        if args.export_dir:
+            title = os.path.splitext(os.path.basename(result.path))[0]
+            sheets.append((title, result.plan, result.anchors))
+    if sheets:
+        export_book(args, sheets)
+    return 1 if failed else 0
+
+
+def run_history(args):
+    from plan_history import PlanHistory
+
+    history = PlanHistory(args.input_dir)
+    print_errors(history.refresh())
+    report = history.activity_report(args.start, args.end, args.language)
+    if not report:
+        print(f"No exported plans found in '{args.input_dir}'.", file=sys.stderr)
+        return 1
+    print("Activity\tRows\tTracked\tEstimate\tReal\tDifference")
+    for stats in report:
+        sign = "-" if stats.difference < 0 else "+"
+        print(f"{stats.name}\t{stats.count}\t{stats.tracked}\t{format_minutes(stats.estimate)}\t"
+              f"{format_minutes(stats.real)}\t{sign}{format_minutes(abs(stats.difference))}")
+    return 0
+
+
+def main(argv=None):
+    """
+    Entry point of the command line mode.
+
+    Args:
+        argv (list or None): Arguments without the program name (sys.argv[1:] when None).
+
+    Returns:
+        int: Process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "plan":
+            return run_plan(args)
+        if args.command == "stream":
+            return run_stream(args)
+        if args.command == "week":
+            return run_week(args)
+        if args.command == "batch":
+            return run_batch(args)
+        if args.command == "history":
+            return run_history(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 2
@@ -1,10 +1,7 @@
-# Imports
+# Imports (Qt and psutil are imported when the GUI starts, the command line mode does not need them)
 import os
 import sys
-import psutil
-from PyQt5 import QtWidgets
-from splash_screen import SplashScreen
-from PyQt5.QtWidgets import QApplication
+import multiprocessing
 
 # Get the directory where the executable or script is located
 if getattr(sys, 'frozen', False):
@@ -18,8 +15,11 @@ else:
 LOCK_FILE = os.path.join(BASE_DIR, ".planner_app.lock")
 # print("Saving/Loading last_info.dat from:", os.path.join(BASE_DIR, "Files", "last_info.dat"))
 LAST_INFO_FILE = os.path.join(BASE_DIR, "Files", "last_info.dat")
+# First arguments that run the command line mode (headless.py) instead of the GUI
+HEADLESS_COMMANDS = ("plan", "stream", "week", "batch", "history")
 
 def prevent_multiple_instances():
+    import psutil
     if os.path.exists(LOCK_FILE):
         try:
             with open(LOCK_FILE, "r") as f:
@@ -51,11 +51,24 @@ def remove_lock():
             os.remove(LOCK_FILE)
 
     except Exception as e:
+        from PyQt5 import QtWidgets
         QtWidgets.QMessageBox.critical(None, "Error", f"Error removing lock file: {e}")
 
 
 # Main function
 def main():
+    # Needed by the process pool of the batch planner in the frozen build
+    multiprocessing.freeze_support()
+
+    # Headless mode, e.g. "python main.py plan --input last_info.dat --export-dir out/"
+    if len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+        import headless
+        sys.exit(headless.main(sys.argv[1:]))
+
+    from PyQt5 import QtWidgets
+    from splash_screen import SplashScreen
+    from PyQt5.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
 
     if not prevent_multiple_instances():
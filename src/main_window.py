@@ -6,13 +6,21 @@ from PyQt5.QtCore import Qt, QCoreApplication
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton, QHBoxLayout, QDesktopWidget, QGroupBox
 
 from about_us import About_us
+from plan_model import PlanModel
 from Custom_Table import CustomTable
 from Settings_Form import SettingsForm
 from Calculation_Page import CalculatePage
+from week_page import WeekPage
+from week_plan import plan_week
+from calculate_times import format_hhmm
 from styles import color_palette, font_families
 from activities_list_form import ActivitiesListForm
+from plan_store import PlanStore
 from utils import read_settings, load_activity_names, create_day_times_list
 
+# Longest list of skipped rows shown in the warning
+MAX_SHOWN_ERRORS = 15
+
 def create_groupbox(title, table, font_family, theme):
     """Create styled group box with table"""
     groupBox = QGroupBox()
@@ -58,6 +66,10 @@ class MainWindow(QWidget):
         self.activity_names = load_activity_names(self.dir_path + "\\Files\\Activity Names.txt")
         self.suggest_lists = {'Activity Name': self.activity_names, 'Duration': self.timelist}
         
+        # Plans of every day, Files/last_info.dat of older versions is imported once
+        self.plan_store = PlanStore(os.path.join(self.dir_path, "Files", "plans.db"))
+        self.plan_store.migrate_last_info(os.path.join(self.dir_path, "Files", "last_info.dat"))
+
         # Setup UI
         self.init_ui()
         self.load_last_info()
@@ -69,7 +81,13 @@ class MainWindow(QWidget):
         # Create tables
         self.activities_with_breaks = CustomTable(self.theme, self.font_families, self.suggest_lists)
         self.activities_without_breaks = CustomTable(self.theme, self.font_families, self.suggest_lists)
-        self.daily_joint_activities = CustomTable(self.theme, self.font_families, self.suggest_lists)
+        self.daily_joint_activities = CustomTable(self.theme, self.font_families, self.suggest_lists, has_start=True)
+
+        # Plan kept up to date row by row while the tables are edited
+        self.plan_model = PlanModel(parent=self)
+        self.plan_model.watch(self.activities_with_breaks, has_rest=True)
+        self.plan_model.watch(self.activities_without_breaks, has_rest=False)
+        self.plan_model.watch(self.daily_joint_activities, has_rest=False)
         
         # Create group boxes
         self.activities_with_breaks_group = create_groupbox("Activities with breaks", self.activities_with_breaks, self.font_families['Group_Box'], self.theme)
@@ -129,6 +147,12 @@ class MainWindow(QWidget):
         """
         calculate_button.setStyleSheet(calculate_button_style)
         calculate_button.clicked.connect(self.calculate_button)
+
+        # Plan week button
+        plan_week_button = QPushButton("Plan Week")
+        plan_week_button.setFixedSize(200, 50)
+        plan_week_button.setStyleSheet(calculate_button_style)
+        plan_week_button.clicked.connect(self.plan_week_button)
         
         # About label
         about_label = QLabel("About", self)
@@ -161,12 +185,20 @@ class MainWindow(QWidget):
         """)
         settings_label.setAlignment(Qt.AlignLeft | Qt.AlignCenter)
         settings_label.mousePressEvent = self.open_settings_window
+
+        # Live summary label
+        self.summary_label = QLabel("", self)
+        self.summary_label.setStyleSheet(f"color: {self.theme['Text']}; font-size: 17px; font-weight: bold;")
+        self.plan_model.plan_changed.connect(self.update_summary)
+        self.update_summary()
         
         # Add widgets to layout
         buttons_layout.addWidget(about_label, alignment=Qt.AlignLeft)
         buttons_layout.addWidget(settings_label, alignment=Qt.AlignLeft)
         buttons_layout.addStretch()
+        buttons_layout.addWidget(self.summary_label)
         buttons_layout.addWidget(show_activities_button)
+        buttons_layout.addWidget(plan_week_button)
         buttons_layout.addWidget(calculate_button)
         buttons_layout.setSpacing(10)
         
@@ -176,6 +208,12 @@ class MainWindow(QWidget):
         self.setLayout(main_layout)
 
 
+    def update_summary(self):
+        """Show the running totals of the plan model"""
+        total = self.plan_model.total_with_rest + self.plan_model.total_without_rest
+        self.summary_label.setText(f"Total: {format_hhmm(total)}    Reminder: {format_hhmm(24 * 3600 - total)}")
+
+
     def center(self):
         """Center window on screen"""
         screen_geometry = QDesktopWidget().screenGeometry()
@@ -185,37 +223,24 @@ class MainWindow(QWidget):
 
 
     def save_last_info(self):
-        """Save table data to file"""
-        files_dir = os.path.join(self.dir_path, "Files")
-        if not os.path.exists(files_dir):
-            os.makedirs(files_dir)
-        file_path = os.path.join(files_dir, "last_info.dat")
+        """Save table data of today to the plan store (only the changed rows are written)"""
         try:
-            with open(file_path, "w", encoding='utf-8') as f:
-                f.write("[Activities with breaks]\n")
-                for row in self.activities_with_breaks.get_data():
-                    f.write(f"{row[0]}|{row[1]}\n")
-                f.write("\n")
-                
-                f.write("\n[Activities without breaks]\n")
-                for row in self.activities_without_breaks.get_data():
-                    f.write(f"{row[0]}|{row[1]}\n")
-                
-                f.write("\n[Daily joint activities]\n")
-                for row in self.daily_joint_activities.get_data():
-                    f.write(f"{row[0]}|{row[1]}\n")
+            self.plan_store.save_day({
+                'with_breaks': [row[:2] for row in self.activities_with_breaks.get_data()],
+                'without_breaks': [row[:2] for row in self.activities_without_breaks.get_data()],
+                'joint_activities': self.daily_joint_activities.get_data(),
+            })
         except Exception as e:
             print(f"Error saving data: {e}")
 
 
-    def load_last_info(self):
-        """Load saved table data from file"""
-        file_path = os.path.join(self.dir_path, "Files", "last_info.dat")
-        if not os.path.exists(file_path):
-            return
-
+    def load_last_info(self, day=None):
+        """Load the saved table data of a day (today by default, else the last plan saved before it)"""
         try:
-           
+            sections = self.plan_store.load_latest(day)
+            if sections is None:
+                return
+
             for table in [
                 self.activities_with_breaks,
                 self.activities_without_breaks,
@@ -223,28 +248,12 @@ class MainWindow(QWidget):
             ]:
                 table.setRowCount(0)
 
-            current_section = None
-            with open(file_path, "r", encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    if line == "[Activities with breaks]":
-                        current_section = "with_breaks"
-                    elif line == "[Activities without breaks]":
-                        current_section = "without_breaks"
-                    elif line == "[Daily joint activities]":
-                        current_section = "joint_activities"
-                    else:
-                        parts = line.split("|")
-                        if len(parts) == 2:
-                            if current_section == "with_breaks":
-                                self.activities_with_breaks.add_row(parts[0], parts[1])
-                            elif current_section == "without_breaks":
-                                self.activities_without_breaks.add_row(parts[0], parts[1])
-                            elif current_section == "joint_activities":
-                                self.daily_joint_activities.add_row(parts[0], parts[1])
+            for name, duration in sections['with_breaks']:
+                self.activities_with_breaks.add_row(name, duration)
+            for name, duration in sections['without_breaks']:
+                self.activities_without_breaks.add_row(name, duration)
+            for row in sections['joint_activities']:
+                self.daily_joint_activities.add_row(*row)
 
             # Clean empty rows  
             for table in [
@@ -266,6 +275,7 @@ class MainWindow(QWidget):
     def closeEvent(self, event):
         """Handle window close event"""
         self.save_last_info()
+        self.plan_store.close()
         event.accept()
 
 
@@ -348,7 +358,7 @@ class MainWindow(QWidget):
                         color: white;
                     }}
                 """)
-            elif button.text() == "Calculate":
+            elif button.text() in ["Calculate", "Plan Week"]:
                 button.setStyleSheet(f"""
                     QPushButton {{
                         background-color: {self.theme['Button']};
@@ -380,6 +390,8 @@ class MainWindow(QWidget):
                     }}
                 """)
                 
+        self.summary_label.setStyleSheet(f"color: {self.theme['Text']}; font-size: 17px; font-weight: bold;")
+
         for table in self.findChildren(CustomTable):
             table.set_theme(self.theme)
             table.set_font_family(self.font_families)
@@ -401,6 +413,27 @@ class MainWindow(QWidget):
                             """)
 
 
+    def input_errors(self):
+        """Row-level errors of the three tables, e.g. "Activities with breaks, row 2: Duration is empty" """
+        errors = []
+        for title, table in [("Activities with breaks", self.activities_with_breaks),
+                             ("Activities without breaks", self.activities_without_breaks),
+                             ("Daily joint activities", self.daily_joint_activities)]:
+            errors += [f"{title}, row {row}: {message}" for row, message in table.parse_rows()[1]]
+        return errors
+
+
+    def show_input_errors(self):
+        """Warn about the rows that are left out of the calculation"""
+        errors = self.input_errors()
+        if not errors:
+            return
+        text = "\n".join(errors[:MAX_SHOWN_ERRORS])
+        if len(errors) > MAX_SHOWN_ERRORS:
+            text += f"\n... and {len(errors) - MAX_SHOWN_ERRORS} more"
+        QtWidgets.QMessageBox.warning(self, "Skipped Rows", f"These rows are not included:\n\n{text}")
+
+
     def calculate_button(self):
         """Handle calculate button click"""
         rest_list = [row for row in self.activities_with_breaks.get_data() if row[0].strip() and row[1].strip()]
@@ -412,10 +445,31 @@ class MainWindow(QWidget):
         if not rest_list and not no_rest_list:
             QtWidgets.QMessageBox.warning(self, "Error", "Please enter at least one activity in the tables.")
             return
-        
+
+        self.show_input_errors()
         try:
-            self.calculate_page = CalculatePage(self.theme, self.font_families, rest_list, no_rest_list, self.settings)
+            self.calculate_page = CalculatePage(self.theme, self.font_families, rest_list, no_rest_list, self.settings,
+                                                plan=self.plan_model.plan())
             self.calculate_page.show()
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"An error occurred during calculation:\n{str(e)}")
-            
\ No newline at end of file
+            
+
+
+    def plan_week_button(self):
+        """Handle plan week button click: table durations are weekly targets, joint activities repeat daily"""
+        rest_list = [row for row in self.activities_with_breaks.get_data() if row[0].strip() and row[1].strip()]
+        no_rest_list = [row for row in self.activities_without_breaks.get_data() if row[0].strip() and row[1].strip()]
+        joint_activities = [row for row in self.daily_joint_activities.get_data() if row[0].strip() and row[1].strip()]
+
+        if not rest_list and not no_rest_list:
+            QtWidgets.QMessageBox.warning(self, "Error", "Please enter at least one activity with or without breaks.")
+            return
+
+        self.show_input_errors()
+        try:
+            week = plan_week(rest_list, no_rest_list, joint_activities)
+            self.week_page = WeekPage(self.theme, self.font_families, week, self.settings)
+            self.week_page.show()
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"An error occurred during planning:\n{str(e)}")
@@ -0,0 +1,156 @@
+import os
+import csv
+import json
+from dataclasses import dataclass
+from timeline import Timeline, format_clock
+
+# Exporter of each format name, filled by register_exporter
+EXPORTERS = {}
+
+# (label, PlanResult attribute in seconds) of the totals, same labels as the summary
+TOTALS = (
+    ("Time With Rest", "total_with_rest"),
+    ("Time Without Rest", "total_without_rest"),
+    ("Total Time", "total"),
+    ("Reminder Time", "remaining"),
+)
+
+CSV_HEADER = ["Activity", "Part", "Kind", "Minutes", "Start", "End", "Has Rest"]
+
+
+@dataclass(frozen=True)
+class Exporter:
+    """
+    One output format of a plan.
+
+    Attributes:
+        name (str): Format name ("csv", "json", ...).
+        extension (str): File extension with the dot.
+        write (callable): write(plan, stream, day_start=None, anchors=None), writes to a text stream.
+    """
+    name: str
+    extension: str
+    write: object
+
+
+def register_exporter(name, extension):
+    """
+    Decorator that registers a write(plan, stream, day_start=None, anchors=None) function as a format.
+
+    Args:
+        name (str): Format name, replaces an exporter registered under the same name.
+        extension (str): File extension with the dot.
+    """
+    def decorator(write):
+        EXPORTERS[name] = Exporter(name, extension, write)
+        return write
+    return decorator
+
+
+def get_exporter(name):
+    """
+    Returns the exporter of a format name.
+
+    Raises:
+        ValueError: If no exporter has that name.
+    """
+    try:
+        return EXPORTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{name}'. Please use one of: {', '.join(sorted(EXPORTERS))}") from None
+
+
+def exporter_for_path(file_path):
+    # Exporter of a file extension (".csv" -> "csv")
+    extension = os.path.splitext(file_path)[1].lower()
+    for exporter in EXPORTERS.values():
+        if exporter.extension == extension:
+            return exporter
+    raise ValueError(f"Unknown export file extension '{extension}'. Please use one of: "
+                     f"{', '.join(sorted(e.extension for e in EXPORTERS.values()))}")
+
+
+def export_plan(plan, file_path, fmt=None, day_start=None, anchors=None):
+    """
+    Writes a plan to a file without loading the Excel libraries.
+
+    Args:
+        plan (PlanResult): Result of CalculateTimes.calculate_plan().
+        file_path (str): Output file.
+        fmt (str or None): Format name, taken from the file extension when None.
+        day_start (str or None): "HH:MM" start of the day, fills the clock times when given.
+        anchors (dict or None): Fixed start (minutes after midnight) by index in plan.activities.
+
+    Returns:
+        str: file_path.
+    """
+    exporter = get_exporter(fmt) if fmt else exporter_for_path(file_path)
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        exporter.write(plan, f, day_start, anchors)
+    return file_path
+
+
+def plan_blocks(plan, day_start=None, anchors=None):
+    """
+    Walks every work and rest block of a plan in order, skipped rows left out.
+
+    The blocks of a row alternate work and rest from a work block, per chunk of a split
+    task; a chunk is one calculated row of plan.rows, its blocks are the lines of the row.
+
+    Yields:
+        tuple: (index in plan.activities, name, has rest, part (chunk from 1), "work" or "rest",
+               minutes, start, end), start and end are "HH:MM" or None without day_start.
+    """
+    timeline = Timeline(plan, day_start, anchors) if day_start is not None else None
+    rows = plan.rows
+    rest_count = len(plan.rest_rows)
+    row_number = 0
+    position = 0
+    for index, blocks in enumerate(plan.blocks):
+        name = plan.activities[index][0]
+        done = 0
+        part = 0
+        while done < len(blocks):
+            has_rest = row_number < rest_count
+            count = rows[row_number][1].count("\n") + 1
+            part += 1
+            for offset in range(count):
+                kind = "rest" if has_rest and offset % 2 else "work"
+                if timeline is None:
+                    start = end = None
+                else:
+                    start, end = format_clock(timeline.starts[position]), format_clock(timeline.ends[position])
+                yield index, name, has_rest, part, kind, blocks[done + offset], start, end
+                position += 1
+            done += count
+            row_number += 1
+
+
+@register_exporter("csv", ".csv")
+def write_csv(plan, stream, day_start=None, anchors=None):
+    # One row per block, then one row per total (Kind "total", minutes only)
+    writer = csv.writer(stream)
+    writer.writerow(CSV_HEADER)
+    writer.writerows((name, part, kind, minutes, start or "", end or "", "Yes" if has_rest else "No")
+                     for _, name, has_rest, part, kind, minutes, start, end in plan_blocks(plan, day_start, anchors))
+    writer.writerows((label, "", "total", getattr(plan, attribute) // 60, "", "", "") for label, attribute in TOTALS)
+
+
+@register_exporter("json", ".json")
+def write_json(plan, stream, day_start=None, anchors=None):
+    # One document: totals and errors first, then the activities, written one at a time
+    totals = {attribute: getattr(plan, attribute) // 60 for _, attribute in TOTALS}
+    totals["fits"] = plan.fits
+    stream.write('{"totals": ' + json.dumps(totals) + ', "errors": ' + json.dumps(list(plan.errors), ensure_ascii=False))
+    stream.write(', "activities": [')
+
+    activity = None
+    for index, name, has_rest, part, kind, minutes, start, end in plan_blocks(plan, day_start, anchors):
+        if activity is None or activity["index"] != index:
+            if activity is not None:
+                stream.write(json.dumps(activity, ensure_ascii=False) + ", ")
+            activity = {"index": index, "name": name, "has_rest": has_rest, "blocks": []}
+        activity["blocks"].append({"part": part, "kind": kind, "minutes": minutes, "start": start, "end": end})
+    if activity is not None:
+        stream.write(json.dumps(activity, ensure_ascii=False))
+    stream.write("]}\n")
@@ -0,0 +1,258 @@
+import os
+import re
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from duration_parser import parse_duration
+
+# plan_<date>_<lang>.xlsx of ExcelTable and plans_<date>_<lang>.xlsx of ExcelBook
+WORKBOOK_PATTERN = re.compile(r"plans?_(\d{4})-(\d{2})-(\d{2})_(En|Fa)\.xlsx")
+# Index of a history directory, kept in the directory itself
+INDEX_NAME = ".daylence_history.json"
+# Bumped when the records of the index change, so older indexes are rebuilt
+INDEX_VERSION = 1
+
+# Persian and Arabic-Indic digits typed in the Fa sheets
+DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789")
+
+
+def cell_minutes(value):
+    """
+    Minutes of a duration cell: the estimate text of an export, or a real time typed by hand.
+
+    Excel turns a typed "1:30" into a time, so times, timedeltas and day fractions are
+    accepted besides the texts of parse_duration() and "H:MM:SS".
+
+    Returns:
+        int or None: Minutes, None for an empty or unreadable cell.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, datetime):
+        return value.hour * 60 + value.minute
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    if isinstance(value, timedelta):
+        return int(value.total_seconds() // 60)
+    if isinstance(value, float) and 0 < value < 1:
+        # A time cell without its number format, in days
+        return round(value * 24 * 60)
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = str(value).strip().translate(DIGITS)
+    if text.count(":") == 2:
+        # "H:MM:SS" of format_duration(), seconds dropped
+        text = text.rpartition(":")[0]
+    return parse_duration(text) if text else None
+
+
+def state_value(value):
+    # A number of the state table, None when it is empty or not a number
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(str(value).strip().translate(DIGITS))
+    except ValueError:
+        return None
+
+
+def workbook_date(year, month, day, language):
+    # Gregorian date of an export file name, the Fa files are named by the Jalali date
+    if language == "En":
+        return date(int(year), int(month), int(day))
+    from persiantools.jdatetime import JalaliDate
+    return JalaliDate(int(year), int(month), int(day)).to_gregorian()
+
+
+def read_workbook(file_path):
+    """
+    Reads the plan sheets of an exported workbook in openpyxl's read-only mode, row by row.
+
+    A plan sheet has the date cell at H2 (the summary sheet of a multi-plan workbook has
+    none). The states are at B3:C3 and the activities at D3:G, the Sleep row last.
+
+    Returns:
+        list: {"sheet", "states": [physical, mental], "rows": [[activity, estimate, real], ...]}
+              of each plan sheet, minutes or None for the times.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    sheets = []
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(min_row=2, min_col=2, max_col=8, values_only=True)
+            header = next(rows, None)
+            if not header or header[-1] is None:
+                continue
+            states = None
+            activities = []
+            for physical, mental, real, _, estimate, name, _ in rows:
+                if states is None:
+                    states = [state_value(physical), state_value(mental)]
+                if name is None or not str(name).strip():
+                    continue
+                activities.append([str(name).strip(), cell_minutes(estimate), cell_minutes(real)])
+            sheets.append({"sheet": ws.title, "states": states or [None, None], "rows": activities})
+    finally:
+        wb.close()
+    return sheets
+
+
+@dataclass(frozen=True)
+class ActivityStats:
+    """
+    Estimate vs real time of one activity over a period.
+
+    Attributes:
+        name (str): Activity name.
+        count (int): Rows of the activity.
+        tracked (int): Rows with a real time.
+        estimate (int): Estimated minutes of the tracked rows.
+        real (int): Real minutes of the tracked rows.
+    """
+    name: str
+    count: int
+    tracked: int
+    estimate: int
+    real: int
+
+    @property
+    def difference(self):
+        # Minutes spent over the estimate (negative when under)
+        return self.real - self.estimate
+
+    @property
+    def ratio(self):
+        return self.real / self.estimate if self.estimate else None
+
+
+class PlanHistory:
+    """
+    History of the exported workbooks of a directory, for estimate vs real time reports.
+
+    Every workbook is read once: its sheets are kept in an index file in the directory
+    with the date, modification time and size of the file, and a refresh only reads the
+    workbooks that are new or changed since. Reports over years of daily files then only
+    load the index.
+
+    Attributes:
+        directory (str): Directory of the exported workbooks.
+        index_path (str): The index file.
+        files (dict): Index entry by file name: mtime_ns, size, date (ISO, Gregorian), language, sheets.
+    """
+    def __init__(self, directory, index_path=None):
+        self.directory = directory
+        self.index_path = index_path or os.path.join(directory, INDEX_NAME)
+        self.files = self.load_index()
+
+    def load_index(self):
+        # Entries of the index file, empty when it is missing or from another version
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("files", {})
+
+    def save_index(self):
+        # Written to a temporary file first, so a reader never finds half an index
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": self.files}, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # A read-only directory still gets reports, the index is then rebuilt on every run
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def refresh(self):
+        """
+        Reads the new and changed workbooks of the directory and drops the deleted ones from the index.
+
+        Returns:
+            list: Messages of the workbooks that could not be read.
+        """
+        errors = []
+        changed = False
+        seen = set()
+        for entry in os.scandir(self.directory):
+            match = WORKBOOK_PATTERN.fullmatch(entry.name)
+            if match is None or not entry.is_file():
+                continue
+            seen.add(entry.name)
+            stat = entry.stat()
+            cached = self.files.get(entry.name)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                continue
+
+            *day, language = match.groups()
+            try:
+                sheets = read_workbook(entry.path)
+                day = workbook_date(*day, language)
+            except Exception as e:
+                # A file open in Excel, a broken zip, an invalid date in the name...
+                errors.append(f"Could not read '{entry.path}': {e}")
+                continue
+            self.files[entry.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                      "date": day.isoformat(), "language": language, "sheets": sheets}
+            changed = True
+
+        for name in set(self.files) - seen:
+            del self.files[name]
+            changed = True
+        if changed:
+            self.save_index()
+        return errors
+
+    def sheets(self, start=None, end=None, language=None):
+        """
+        Plan sheets of a period, one per day and sheet title.
+
+        Both languages of a day are usually exported, but only one is filled in: without
+        language, the file with the most real times is taken.
+
+        Args:
+            start (date or None): First day (no limit when None).
+            end (date or None): Last day (no limit when None).
+            language (str or None): "En" or "Fa" to read only the files of one language.
+
+        Returns:
+            list: (date, index entry of the sheet) sorted by date and title.
+        """
+        start = start.isoformat() if start else ""
+        end = end.isoformat() if end else "9999"
+        chosen = {}
+        for entry in self.files.values():
+            if not start <= entry["date"] <= end or (language and entry["language"] != language):
+                continue
+            for sheet in entry["sheets"]:
+                key = (entry["date"], sheet["sheet"] if len(entry["sheets"]) > 1 else "")
+                tracked = sum(row[2] is not None for row in sheet["rows"])
+                if key not in chosen or tracked > chosen[key][0]:
+                    chosen[key] = (tracked, sheet)
+        return [(date.fromisoformat(day), sheet) for (day, _), (_, sheet) in sorted(chosen.items())]
+
+    def activity_report(self, start=None, end=None, language=None):
+        """
+        Totals of estimated and real time of every activity over a period, see sheets().
+
+        Only the rows with both times are added up, so untracked rows do not lower the real time.
+
+        Returns:
+            list: ActivityStats sorted by activity name.
+        """
+        totals = {}
+        for _, sheet in self.sheets(start, end, language):
+            for name, estimate, real in sheet["rows"]:
+                stats = totals.setdefault(name, [0, 0, 0, 0])
+                stats[0] += 1
+                if estimate is not None and real is not None:
+                    stats[1] += 1
+                    stats[2] += estimate
+                    stats[3] += real
+        return [ActivityStats(name, *stats) for name, stats in sorted(totals.items())]
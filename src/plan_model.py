@@ -0,0 +1,116 @@
+from functools import partial
+from PyQt5.QtCore import QObject, pyqtSignal
+from calculate_times import CalculateTimes, PlanResult
+
+
+class PlanModel(QObject):
+    """
+    Keeps the plan of the main window tables up to date while they are edited.
+
+    Each row is calculated once, when it changes, and the totals are moved by the
+    difference between its old and new value. Reading the plan only collects the
+    stored rows instead of running the pipeline on every activity again.
+
+    Attributes:
+        calc (CalculateTimes): Calculator used for single rows.
+        tables (dict): Watched tables and whether they have rest, in plan order.
+        entries (dict): Per table list of row entries (None for empty rows), each with the
+            messages of its own invalid input, replaced when the row is recalculated.
+        total_with_rest (int): Running total of activities with rest (seconds).
+        total_without_rest (int): Running total of activities without rest (seconds).
+    """
+    plan_changed = pyqtSignal()
+
+    def __init__(self, rules=None, parent=None):
+        super().__init__(parent)
+        self.calc = CalculateTimes([], [], rules)
+        self.tables = {}
+        self.entries = {}
+        self.total_with_rest = 0
+        self.total_without_rest = 0
+
+    def watch(self, table, has_rest):
+        """
+        Starts following the edits of a CustomTable.
+
+        Args:
+            table (CustomTable): The table to follow.
+            has_rest (bool): Whether rest times are added to the activities of this table.
+        """
+        self.tables[table] = has_rest
+        self.entries[table] = [None] * table.rowCount()
+        for row in range(table.rowCount()):
+            self.update_row(table, row)
+
+        table.itemChanged.connect(lambda item, table=table: self.update_row(table, item.row()))
+        table.model().rowsInserted.connect(partial(self.insert_rows, table))
+        table.model().rowsRemoved.connect(partial(self.remove_rows, table))
+
+    def update_row(self, table, row):
+        """Recalculates one row and moves the totals by the difference."""
+        entries = self.entries[table]
+        if not 0 <= row < len(entries):
+            return
+        has_rest = self.tables[table]
+
+        entry = None
+        row_data = table.row_data(row)
+        if row_data:
+            # Only this row's messages: the shared calculator does not keep those of older edits
+            self.calc.errors = []
+            activities = self.calc.calculate_activity(row_data[0], row_data[1], has_rest)
+            entry = (tuple(row_data[:2]), self.calc.convert_activities_to_list(activities),
+                     self.calc.total_seconds(activities), tuple(b for item in activities for b in item.blocks),
+                     tuple(self.calc.errors))
+
+        self.add_to_totals(entries[row], has_rest, -1)
+        entries[row] = entry
+        self.add_to_totals(entry, has_rest, 1)
+        self.plan_changed.emit()
+
+    def insert_rows(self, table, parent, first, last):
+        self.entries[table][first:first] = [None] * (last - first + 1)
+
+    def remove_rows(self, table, parent, first, last):
+        has_rest = self.tables[table]
+        for entry in self.entries[table][first:last + 1]:
+            self.add_to_totals(entry, has_rest, -1)
+        del self.entries[table][first:last + 1]
+        self.plan_changed.emit()
+
+    def add_to_totals(self, entry, has_rest, sign):
+        if entry is None:
+            return
+        if has_rest:
+            self.total_with_rest += sign * entry[2]
+        else:
+            self.total_without_rest += sign * entry[2]
+
+    def plan(self):
+        """
+        Builds the current PlanResult from the stored rows (no recalculation).
+
+        Returns:
+            PlanResult: Same result as CalculateTimes.calculate_plan() on the table data.
+        """
+        activities = {True: [], False: []}
+        rows = {True: [], False: []}
+        blocks = {True: [], False: []}
+        errors = {True: [], False: []}
+        for table, has_rest in self.tables.items():
+            for entry in self.entries[table]:
+                if entry is not None:
+                    activities[has_rest].append(entry[0])
+                    rows[has_rest].extend(entry[1])
+                    blocks[has_rest].append(entry[3])
+                    errors[has_rest].extend(entry[4])
+
+        return PlanResult(
+            activities=tuple(activities[True] + activities[False]),
+            rest_rows=tuple(rows[True]),
+            no_rest_rows=tuple(rows[False]),
+            total_with_rest=self.total_with_rest,
+            total_without_rest=self.total_without_rest,
+            errors=tuple(errors[True] + errors[False]),
+            blocks=tuple(blocks[True] + blocks[False]),
+        )
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+from datetime import date, datetime
+from utils import LAST_INFO_SECTIONS, read_last_info
+
+STORE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Files", "plans.db")
+# Plan file of older versions, imported into the store the first time it is opened
+LAST_INFO_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Files", "last_info.dat")
+SECTIONS = tuple(LAST_INFO_SECTIONS.values())
+
+# The primary key is the index: rows of a day, of a section of a day, or one row, are found
+# without a scan. WITHOUT ROWID stores the rows in that order.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plan_rows (
+    day TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    duration TEXT NOT NULL,
+    start TEXT,
+    PRIMARY KEY (day, section, position)
+) WITHOUT ROWID
+"""
+
+# Rows that did not change are not written again
+UPSERT = """
+INSERT INTO plan_rows (day, section, position, name, duration, start) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, section, position) DO UPDATE SET
+    name = excluded.name, duration = excluded.duration, start = excluded.start
+WHERE (name, duration, start) IS NOT (excluded.name, excluded.duration, excluded.start)
+"""
+
+
+def day_key(day=None):
+    # ISO text of a date ("YYYY-MM-DD" as given, today when None)
+    if day is None:
+        day = date.today()
+    return day if isinstance(day, str) else day.isoformat()
+
+
+class PlanStore:
+    """
+    The plans of every day in an SQLite database, by day, section and row.
+
+    The database runs in WAL mode, so a save does not block readers (the headless mode
+    can read while the GUI writes). A save only writes the rows that changed.
+
+    Sections are the keys of utils.LAST_INFO_SECTIONS and a day's plan has the shape of
+    read_last_info(): [name, duration] rows, or [name, duration, start] for joint activities
+    with a fixed start.
+
+    Attributes:
+        path (str): The database file.
+        connection (sqlite3.Connection): Open connection.
+    """
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a crash may lose the last save, never corrupt the file
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def upsert_row(self, day, section, position, name, duration, start=None):
+        """Inserts or updates one row of a day's section."""
+        with self.connection:
+            self.connection.execute(UPSERT, (day_key(day), section, position, name, duration, start or None))
+
+    def save_day(self, sections, day=None):
+        """
+        Stores the plan of a day in one transaction: changed rows are upserted and the rows
+        past the end of each section are deleted.
+
+        Args:
+            sections (dict): Rows by section, like read_last_info() returns (missing sections are emptied).
+            day (date or str or None): The day (today when None).
+        """
+        day = day_key(day)
+        with self.connection:
+            for section in SECTIONS:
+                rows = sections.get(section, [])
+                self.connection.executemany(UPSERT, [
+                    (day, section, position, row[0], row[1], row[2] if len(row) > 2 and row[2] else None)
+                    for position, row in enumerate(rows)])
+                self.connection.execute("DELETE FROM plan_rows WHERE day = ? AND section = ? AND position >= ?",
+                                        (day, section, len(rows)))
+
+    def load_day(self, day=None):
+        """
+        Reads the plan of a day.
+
+        Returns:
+            dict or None: Rows by section like read_last_info(), None when nothing was saved that day.
+        """
+        cursor = self.connection.execute(
+            "SELECT section, name, duration, start FROM plan_rows WHERE day = ? ORDER BY section, position",
+            (day_key(day),))
+        sections = {section: [] for section in SECTIONS}
+        found = False
+        for section, name, duration, start in cursor:
+            sections.setdefault(section, []).append([name, duration, start] if start else [name, duration])
+            found = True
+        return sections if found else None
+
+    def days(self):
+        # Days with a saved plan, oldest first
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT day FROM plan_rows ORDER BY day")]
+
+    def latest_day(self):
+        # Last day with a saved plan, None for an empty store
+        return self.connection.execute("SELECT MAX(day) FROM plan_rows").fetchone()[0]
+
+    def load_latest(self, day=None):
+        """
+        Plan of a day, or of the last day saved before it when that day has none (a new day
+        starts from the previous plan).
+
+        Returns:
+            dict or None: Rows by section, None for an empty store.
+        """
+        day = day_key(day)
+        sections = self.load_day(day)
+        if sections is None:
+            previous = self.connection.execute("SELECT MAX(day) FROM plan_rows WHERE day < ?", (day,)).fetchone()[0]
+            if previous is not None:
+                sections = self.load_day(previous)
+        return sections
+
+    def migrate_last_info(self, file_path=LAST_INFO_PATH):
+        """
+        Imports a last_info.dat plan into an empty store, as the plan of the day the file was last saved.
+
+        The file itself is left in place for older versions, but it is not written again: after
+        the migration it keeps the plan as it was then.
+
+        Returns:
+            bool: True when the file was imported.
+        """
+        if self.latest_day() is not None or not os.path.exists(file_path):
+            return False
+        day = datetime.fromtimestamp(os.path.getmtime(file_path)).date()
+        self.save_day(read_last_info(file_path), day)
+        return True
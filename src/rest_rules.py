@@ -0,0 +1,155 @@
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Files", "rest_rules.dat")
+
+# Built-in policy, used when Files/rest_rules.dat does not exist: (below, first block, breaks)
+DEFAULT_RULES = [
+    (30, 0, (5,)),
+    (2 * 60, 0, (10,)),
+    (3 * 60 + 1, 0, (10, 15)),
+    (5 * 60, 60, (10, 10, 20)),
+]
+DEFAULT_SPLIT_AT = 5 * 60
+DEFAULT_CHUNK = 4 * 60
+
+# Durations covered by the lookup tables of a rule set (one day)
+TABLE_MINUTES = 24 * 60
+
+
+class RestRules:
+    """
+    A rest policy compiled into sorted breakpoints.
+
+    Each rule covers durations below its bound (in minutes). A duration is split into an
+    optional first work block followed by a break, then the rest of the work is divided
+    evenly in front of the remaining breaks (odd minutes go to the first parts).
+    Durations past the last bound get no rest.
+
+    Attributes:
+        bounds (list): Sorted exclusive upper bounds of the rules (minutes).
+        leads (list): First work block of each rule (minutes, 0 for none).
+        breaks (list): Tuple of break lengths of each rule (minutes).
+        split_at (int): Tasks of at least this many minutes are split into chunks.
+        chunk (int): Length of one chunk of a split task (minutes).
+        table (tuple): breakdown() of every duration below TABLE_MINUTES.
+        planned_table (tuple): planned_minutes() of every duration below TABLE_MINUTES.
+    """
+    def __init__(self, rules=DEFAULT_RULES, split_at=DEFAULT_SPLIT_AT, chunk=DEFAULT_CHUNK):
+        rules = sorted((int(below), int(lead), tuple(int(b) for b in breaks)) for below, lead, breaks in rules)
+        for below, lead, breaks in rules:
+            if not breaks:
+                raise ValueError(f"Rule below {below} minutes has no breaks")
+            if lead and len(breaks) < 2:
+                raise ValueError(f"Rule below {below} minutes needs a break after the first block and one more")
+        if chunk <= 0:
+            raise ValueError("Chunk length should be a positive number of minutes")
+
+        self.bounds = [rule[0] for rule in rules]
+        self.leads = [rule[1] for rule in rules]
+        self.breaks = [rule[2] for rule in rules]
+        self.split_at = int(split_at)
+        self.chunk = int(chunk)
+
+        # Rest blocks of every duration of a day are computed once here (a few ms), so adding
+        # rest times to an activity is a tuple lookup instead of a bisect and a divmod
+        self.table = tuple(self.compute_breakdown(minutes) for minutes in range(TABLE_MINUTES))
+        self.planned_table = tuple(sum(sum(self.table[chunk]) for chunk in self.split(minutes))
+                                   for minutes in range(TABLE_MINUTES))
+
+    @classmethod
+    def load(cls, file_path=RULES_PATH):
+        """
+        Loads a rule set from a sectioned text file, or the built-in rules if the file does not exist.
+
+        Args:
+            file_path (str): Path of the rules file.
+
+        Returns:
+            RestRules: The compiled rule set.
+
+        Raises:
+            ValueError: If a line of the file cannot be read.
+        """
+        if not os.path.exists(file_path):
+            return cls()
+
+        rules = []
+        options = {'split_at': DEFAULT_SPLIT_AT, 'chunk': DEFAULT_CHUNK}
+        current_section = None
+        with open(file_path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    if line == "[Long tasks]":
+                        current_section = "long_tasks"
+                    elif line == "[Rules]":
+                        current_section = "rules"
+                    elif current_section == "long_tasks":
+                        key, value = line.split(":")
+                        if key.strip() not in options:
+                            raise ValueError(f"unknown option '{key.strip()}'")
+                        options[key.strip()] = int(value)
+                    elif current_section == "rules":
+                        below, lead, breaks = line.split("|")
+                        rules.append((int(below), int(lead), tuple(int(b) for b in breaks.split(","))))
+                    else:
+                        raise ValueError("line outside of a section")
+                except ValueError as e:
+                    raise ValueError(f"Invalid rest rule at {file_path}:{number}: {line!r} ({e})")
+
+        return cls(rules, **options)
+
+    def classify(self, minutes):
+        # Index of the rule used for a duration, None when it is past the last bound
+        index = bisect_right(self.bounds, minutes)
+        return index if index < len(self.bounds) else None
+
+    def breakdown(self, minutes):
+        # Work and rest blocks (minutes) for one duration, from the table when it is shorter than a day
+        if 0 <= minutes < TABLE_MINUTES:
+            return self.table[minutes]
+        return self.compute_breakdown(minutes)
+
+    def compute_breakdown(self, minutes):
+        # Work and rest blocks (minutes) for one duration, worked out from the rules
+        index = self.classify(minutes)
+        if index is None:
+            return (minutes,)
+
+        lead, breaks = self.leads[index], self.breaks[index]
+        blocks = []
+        work = minutes
+        if lead:
+            blocks += [lead, breaks[0]]
+            work -= lead
+            breaks = breaks[1:]
+        base, extra = divmod(work, len(breaks))
+        for i, rest in enumerate(breaks):
+            blocks += [base + 1 if i < extra else base, rest]
+        return tuple(blocks)
+
+    def planned_minutes(self, minutes):
+        # Length of a task once it is split and its rest times are added
+        if 0 <= minutes < TABLE_MINUTES:
+            return self.planned_table[minutes]
+        return sum(sum(self.breakdown(chunk)) for chunk in self.split(minutes))
+
+    def split(self, minutes):
+        # Chunk lengths of a task, a single part when it is shorter than split_at
+        if minutes < self.split_at:
+            return [minutes]
+        chunks = []
+        while minutes > 0:
+            chunks.append(min(minutes, self.chunk))
+            minutes -= self.chunk
+        return chunks
+
+
+@lru_cache(maxsize=None)
+def load_rest_rules(file_path=RULES_PATH):
+    """Loads and caches the rule set of a file (Files/rest_rules.dat by default)."""
+    return RestRules.load(file_path)
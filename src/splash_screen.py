@@ -2,6 +2,7 @@ import os
 from utils import read_settings
 from PyQt5.QtCore import Qt, QUrl  
 from main_window import MainWindow
+from export_worker import warm_up_export
 from styles import color_palette, font_families
 from PyQt5.QtGui import QPalette, QColor, QPixmap  
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent  
@@ -11,6 +12,9 @@ class SplashScreen(QSplashScreen):
 	def __init__(self):
 		super().__init__()
 
+		# Load the Excel export libraries while the splash screen is shown
+		warm_up_export()
+
 		# Initialization
 		self.dir_path = os.path.dirname(os.path.realpath(__file__))
 		self.settings = read_settings(self.dir_path + "\\Files\\settings.dat")
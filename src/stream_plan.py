@@ -0,0 +1,198 @@
+import os
+import csv
+import json
+from calculate_times import CalculateTimes, Activity, DAY_SECONDS, day_seconds
+from duration_parser import parse_duration, duration_error
+
+# Sections of an input row; only activities with breaks get rest times
+SECTIONS = ("with_breaks", "without_breaks", "joint_activities")
+# Messages kept of the skipped rows of a log; past that they are only counted
+MAX_ERRORS = 100
+
+
+class ErrorLog:
+    """
+    The first messages of the skipped input rows and the number of all of them, so a log
+    full of bad rows still takes constant memory.
+
+    Iterating gives the kept messages.
+
+    Attributes:
+        limit (int): Number of messages kept.
+        messages (list): The first limit messages.
+        count (int): Number of messages appended.
+    """
+    def __init__(self, limit=MAX_ERRORS):
+        self.limit = limit
+        self.messages = []
+        self.count = 0
+
+    def append(self, message):
+        self.count += 1
+        if len(self.messages) < self.limit:
+            self.messages.append(message)
+
+    @property
+    def dropped(self):
+        # Messages counted but not kept
+        return self.count - len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+
+def read_csv_rows(file_path, errors=None):
+    """
+    Lazily reads a CSV activity log with name,duration[,section] columns (an optional header row is skipped).
+
+    Args:
+        file_path (str): Path of the log.
+        errors (list or ErrorLog or None): Gets a "<file>:<line>: ..." message for each malformed row, which is skipped.
+
+    Yields:
+        tuple: (section, name, duration) for each row.
+    """
+    errors = errors if errors is not None else []
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        first = True
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                errors.append(f"{file_path}:{reader.line_num}: Invalid CSV row: {e}")
+                continue
+            if not row:
+                continue
+            if first and row[0].strip().lower() == "name":
+                first = False
+                continue
+            first = False
+            if len(row) < 2:
+                errors.append(f"{file_path}:{reader.line_num}: Expected name,duration[,section] columns, got {len(row)}")
+                continue
+            section = row[2].strip() if len(row) > 2 and row[2].strip() else "with_breaks"
+            yield section, row[0], row[1]
+
+
+def read_jsonl_rows(file_path, errors=None):
+    """
+    Lazily reads a JSON-lines activity log, one {"name", "duration", "section"} object per line.
+
+    Args:
+        file_path (str): Path of the log.
+        errors (list or ErrorLog or None): Gets a "<file>:<line>: ..." message for each malformed line, which is skipped.
+
+    Yields:
+        tuple: (section, name, duration) for each line.
+    """
+    errors = errors if errors is not None else []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors.append(f"{file_path}:{number}: Invalid JSON: {e.msg} (column {e.colno})")
+                continue
+            if not isinstance(item, dict):
+                errors.append(f"{file_path}:{number}: Expected a JSON object, got {type(item).__name__}")
+                continue
+            yield item.get("section") or "with_breaks", str(item.get("name", "")), str(item.get("duration", ""))
+
+
+def read_rows(file_path, errors=None):
+    # Picks the reader from the file extension (.csv, else JSON lines)
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        return read_csv_rows(file_path, errors)
+    return read_jsonl_rows(file_path, errors)
+
+
+class StreamingPlan:
+    """
+    Calculates an activity log as a chain of generators, in constant memory.
+
+    Parsing, long-task splitting and rest insertion each handle one activity at a time,
+    and the totals are accumulated while the rows are consumed, so they are complete
+    once iteration has finished.
+
+    Attributes:
+        rows (iterable): (section, name, duration) input rows.
+        calc (CalculateTimes): Calculator providing the parser and the rest rules.
+        total_with_rest (int): Running total of activities with rest (seconds).
+        total_without_rest (int): Running total of activities without rest (seconds).
+        count (int): Number of output rows so far.
+        errors (ErrorLog): Messages of the input rows that were skipped (the first MAX_ERRORS) and their count.
+    """
+    def __init__(self, rows, rules=None):
+        self.rows = rows
+        self.calc = CalculateTimes([], [], rules)
+        self.total_with_rest = 0
+        self.total_without_rest = 0
+        self.count = 0
+        self.errors = ErrorLog()
+
+    @classmethod
+    def from_file(cls, file_path, rules=None):
+        # Malformed lines of the file are reported in errors, like invalid durations
+        plan = cls((), rules)
+        plan.rows = read_rows(file_path, plan.errors)
+        return plan
+
+    @property
+    def total(self):
+        return self.total_with_rest + self.total_without_rest
+
+    @property
+    def remaining(self):
+        return DAY_SECONDS - self.total
+
+    @property
+    def fits(self):
+        return self.total <= DAY_SECONDS
+
+    def parse(self, rows):
+        # (section, name, duration) -> (has_rest, Activity), invalid rows are skipped
+        for section, name, duration in rows:
+            if section not in SECTIONS:
+                self.errors.append(f"Skipping activity '{name}' with unknown section '{section}'")
+                continue
+            if not name.strip() or not duration.strip():
+                continue
+            minutes = parse_duration(duration)
+            if minutes is None:
+                self.errors.append(f"Skipping invalid activity '{name}' with time '{duration}': {duration_error(duration)}")
+                continue
+            yield section == "with_breaks", Activity(name, minutes)
+
+    def split_long_tasks(self, items):
+        rules = self.calc.rules
+        for has_rest, item in items:
+            if has_rest and item.minutes >= rules.split_at:
+                for chunk in rules.split(item.minutes):
+                    yield has_rest, Activity(item.name, chunk)
+            else:
+                yield has_rest, item
+
+    def add_rest_times(self, items):
+        breakdown = self.calc.rules.breakdown
+        for has_rest, item in items:
+            item.blocks = breakdown(item.minutes) if has_rest else (item.minutes,)
+            yield has_rest, item
+
+    def __iter__(self):
+        """
+        Yields:
+            tuple: (has_rest, (name, sub durations, duration)) for each processed activity.
+        """
+        for has_rest, item in self.add_rest_times(self.split_long_tasks(self.parse(self.rows))):
+            seconds = sum(day_seconds(b) for b in item.blocks)
+            if has_rest:
+                self.total_with_rest += seconds
+            else:
+                self.total_without_rest += seconds
+            self.count += 1
+            yield has_rest, self.calc.convert_activities_to_list((item,))[0]
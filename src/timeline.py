@@ -0,0 +1,136 @@
+from itertools import accumulate
+
+DEFAULT_DAY_START = "08:00"
+
+
+def parse_clock(clock):
+    # Converts a "HH:MM" clock time into minutes after midnight
+    hours, _, minutes = clock.strip().partition(":")
+    if not (hours.isdigit() and minutes.isdigit() and int(hours) < 24 and int(minutes) < 60):
+        raise ValueError(f"Invalid clock time '{clock}'. Please use hh:mm format.")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_clock(minutes):
+    # Formats minutes after midnight as "HH:MM" (times after midnight wrap to the next day)
+    return f"{(minutes // 60) % 24:02}:{minutes % 60:02}"
+
+
+def format_span(start, end):
+    return f"{format_clock(start)} - {format_clock(end)}"
+
+
+def anchors_from_rows(list_with_rest, list_without_rest):
+    """
+    Fixed start times of the input rows that have a third "HH:MM" item.
+
+    Returns:
+        dict: Start (minutes after midnight) by index in plan.activities.
+    """
+    rows = list(list_with_rest) + list(list_without_rest)
+    return {index: parse_clock(row[2]) for index, row in enumerate(rows) if len(row) > 2 and row[2].strip()}
+
+
+class Timeline:
+    """
+    Clock times of every work and rest block of a plan, from a day start time.
+
+    Without anchors all blocks are laid out one after the other in plan order, so the
+    start of each block is a prefix sum of the block lengths and the whole timeline is
+    built in one O(n) pass.
+
+    Anchored activities (fixed start time) are sorted by start and swept once: an anchor
+    that starts before the latest end seen so far overlaps it and is reported as a
+    conflict. The flexible blocks then fill the gaps in plan order; a block that would run
+    into the next anchor moves after it. O(n + a log a) for n blocks and a anchors.
+
+    Attributes:
+        day_start (int): Start of the day (minutes after midnight).
+        starts (list): Start of every block (minutes after midnight).
+        ends (list): End of every block (minutes after midnight).
+        offsets (list): Index of the first block of each activity (one extra item at the end).
+        conflicts (list): (index, index) pairs of anchored activities that overlap.
+    """
+    def __init__(self, plan, day_start=DEFAULT_DAY_START, anchors=None):
+        """
+        Args:
+            plan (PlanResult): The calculated plan.
+            day_start (str or int): Start of the day as "HH:MM" or in minutes after midnight.
+            anchors (dict or None): Fixed start (minutes after midnight) by index in plan.activities.
+        """
+        if isinstance(day_start, str):
+            day_start = parse_clock(day_start)
+        self.day_start = day_start
+        self.offsets = list(accumulate((len(blocks) for blocks in plan.blocks), initial=0))
+        self.conflicts = []
+        anchors = {index: start for index, start in (anchors or {}).items() if plan.blocks[index]}
+        if not anchors:
+            flat_blocks = [b for blocks in plan.blocks for b in blocks]
+            bounds = list(accumulate(flat_blocks, initial=day_start))
+            self.starts = bounds[:-1]
+            self.ends = bounds[1:]
+            return
+
+        self.starts = [0] * self.offsets[-1]
+        self.ends = [0] * self.offsets[-1]
+
+        # Anchors as (start, end, index) from the day start on, a start before it belongs to the next day
+        windows = []
+        for index, start in anchors.items():
+            start = day_start + (start - day_start) % (24 * 60)
+            end = self.place(plan.blocks[index], self.offsets[index], start)
+            windows.append((start, end, index))
+        windows.sort()
+
+        latest_end, latest_index = day_start, None
+        for start, end, index in windows:
+            if latest_index is not None and start < latest_end:
+                self.conflicts.append((latest_index, index))
+            if end > latest_end:
+                latest_end, latest_index = end, index
+
+        time = day_start
+        next_window = 0
+        for index, blocks in enumerate(plan.blocks):
+            if index in anchors:
+                continue
+            for position, block in enumerate(blocks, self.offsets[index]):
+                while next_window < len(windows) and time + block > windows[next_window][0]:
+                    time = max(time, windows[next_window][1])
+                    next_window += 1
+                self.starts[position] = time
+                time += block
+                self.ends[position] = time
+
+    def place(self, blocks, first, start):
+        # Lays out consecutive blocks from start, returns their end
+        for position, block in enumerate(blocks, first):
+            self.starts[position] = start
+            start += block
+            self.ends[position] = start
+        return start
+
+    def activity_span(self, index):
+        # (start, end) of all blocks of an activity, None for a skipped row
+        first, last = self.offsets[index], self.offsets[index + 1]
+        if first == last:
+            return None
+        return self.starts[first], self.ends[last - 1]
+
+    def activity_texts(self):
+        # "HH:MM - HH:MM" for each entry of plan.activities ("" for skipped rows)
+        texts = []
+        for index in range(len(self.offsets) - 1):
+            span = self.activity_span(index)
+            texts.append(format_span(*span) if span else "")
+        return texts
+
+    def row_texts(self, rows):
+        # One "HH:MM - HH:MM" line per block of each calculated (name, sub durations, duration) row
+        texts = []
+        position = 0
+        for row in rows:
+            count = row[1].count("\n") + 1
+            texts.append("\n".join(format_span(self.starts[i], self.ends[i]) for i in range(position, position + count)))
+            position += count
+        return texts
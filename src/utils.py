@@ -1,6 +1,12 @@
 import os
 import sys
-from PIL import Image
+
+# Section headers of Files/last_info.dat and the keys returned by read_last_info
+LAST_INFO_SECTIONS = {
+	"[Activities with breaks]": "with_breaks",
+	"[Activities without breaks]": "without_breaks",
+	"[Daily joint activities]": "joint_activities",
+}
 
 def number2roman_numerals (integernumber:int):
     """
@@ -33,11 +39,12 @@ def number2alphabetic (integernumber:int):
 	return result
 
 def read_settings(settings_path):
-	settings = {'Theme': 'dark_red', 'Font': 'First', 'Number_Format': 'Numbers'}
+	settings = {'Theme': 'dark_red', 'Font': 'First', 'Number_Format': 'Numbers', 'Day_Start': '08:00'}
 	if os.path.exists(settings_path):
 		with open(settings_path, "r") as file:
 			for line in file:
-				key, value = line.strip().split(":")
+				# Split once, values such as Day_Start (08:00) contain ':'
+				key, value = line.strip().split(":", 1)
 				settings[key.strip()] = value.strip()
 	else:
 		with open(settings_path, "w") as file:
@@ -47,11 +54,59 @@ def read_settings(settings_path):
 	return settings
 
 
+def read_last_info(file_path):
+	"""
+	Read a sectioned last_info.dat plan file without any GUI.
+
+	Args:
+		file_path (str): Path of the plan file.
+
+	Returns:
+		dict: Lists of [name, duration] (or [name, duration, start]) rows for the keys of LAST_INFO_SECTIONS
+		      ('with_breaks', 'without_breaks', 'joint_activities').
+	"""
+	sections = {key: [] for key in LAST_INFO_SECTIONS.values()}
+	current_section = None
+	with open(file_path, "r", encoding='utf-8') as f:
+		for line in f:
+			line = line.strip()
+			if not line:
+				continue
+			if line in LAST_INFO_SECTIONS:
+				current_section = LAST_INFO_SECTIONS[line]
+			elif current_section is not None:
+				parts = line.split("|")
+				# name|duration, joint activities may add |start
+				if len(parts) in (2, 3):
+					sections[current_section].append(parts)
+	return sections
+
+
+def sections_to_lists(sections):
+	# Rows by section (read_last_info() or PlanStore.load_day()) into the lists of the Calculate button
+	rows = {key: [row for row in value if row[0].strip() and row[1].strip()] for key, value in sections.items()}
+	return rows['with_breaks'], rows['without_breaks'] + rows['joint_activities']
+
+
+def load_lists(file_path):
+	"""
+	Reads a last_info.dat style file into the lists of the Calculate button.
+
+	Args:
+		file_path (str): Path of the plan file.
+
+	Returns:
+		tuple: ([name, duration] rows with rest, rows without rest and joint activities).
+	"""
+	return sections_to_lists(read_last_info(file_path))
+
+
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')  
     return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
 
 def change_image_color(input_image_path, output_image_path, target_hex_color, new_hex_color):
+    from PIL import Image
     
     target_color = hex_to_rgb(target_hex_color)
     new_color = hex_to_rgb(new_hex_color)
@@ -0,0 +1,123 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPalette, QColor
+from Custom_TableView import CustomView
+from calculate_times import format_hhmm
+from week_plan import format_minutes
+from Calculation_Page import CalculatePage, ExportPageMixin, create_group_box
+from export_worker import ExportWorker, EXPORT_LANGUAGES
+from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QHBoxLayout, QTableView, QTabWidget, QWidget
+
+
+class WeekPage(ExportPageMixin, QMainWindow):
+    """
+    Shows a week plan: a summary tab, then one Calculation Page layout per day.
+
+    Attributes:
+        week (WeekPlan): The packed week.
+        pages (list): CalculatePage of each day.
+    """
+    def __init__(self, theme, font_family, week, settings):
+        super().__init__()
+        self.theme = theme
+        self.fontFamilies = font_family
+        self.settings = settings
+        self.week = week
+
+        # Window setup
+        self.setWindowTitle("Week Page")
+        self.resize(1680, 900)
+        self.setMinimumSize(1000, 400)
+
+        self.setAutoFillBackground(True)
+        palette = self.palette()
+        palette.setColor(QPalette.Window, QColor(self.theme["Background"]))
+        self.setPalette(palette)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+
+        self.tabs = QTabWidget()
+        self.tabs.setFont(self.fontFamilies['Group_Box'])
+        self.tabs.setStyleSheet(f"""
+            QTabWidget::pane {{
+                border: 0px;
+            }}
+            QTabBar::tab {{
+                background-color: {self.theme['Button']};
+                color: {self.theme['Text']};
+                border: 2px solid {self.theme['Header']};
+                padding: 6px 18px;
+                border-radius: 6px;
+                margin: 2px;
+            }}
+            QTabBar::tab:selected {{
+                background-color: {self.theme['Header']};
+            }}
+            QTabBar::tab:hover {{
+                background-color: {self.theme['Hover']};
+                color: white;
+            }}
+        """)
+        self.tabs.addTab(self.create_summary_tab(), "Week")
+
+        # Each day reuses the Calculation Page, without its own buttons
+        self.pages = []
+        for day, ((rest_rows, no_rest_rows), plan) in enumerate(zip(self.week.days, self.week.plans), 1):
+            page = CalculatePage(self.theme, self.fontFamilies, rest_rows, no_rest_rows, self.settings, plan=plan)
+            page.setWindowFlags(Qt.Widget)
+            page.export_excel_button.hide()
+            page.ok_button.hide()
+            self.pages.append(page)
+            self.tabs.addTab(page, f"Day {day}")
+
+        main_layout.addWidget(self.tabs)
+
+        # One workbook per language with a sheet per day, instead of the buttons of each day
+        main_layout.addLayout(self.create_buttons())
+
+    def create_summary_tab(self):
+        """Create the tab with the totals of every day and the sessions that did not fit"""
+        widget = QWidget()
+        layout = QHBoxLayout(widget)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        days_data = [[f"Day {day}", format_hhmm(plan.total), format_hhmm(plan.remaining), "Yes" if plan.fits else "No"]
+                     for day, plan in enumerate(self.week.plans, 1)]
+        unplaced_data = [[name, format_minutes(minutes)] for name, minutes, _ in self.week.unplaced]
+        tables = [
+            ("Week Summary", ["Day", "Total Time", "Reminder Time", "Status"], days_data),
+            ("Unplaced Sessions", ["Activity", "Duration"], unplaced_data),
+        ]
+
+        for header, column_names, table_data in tables:
+            # Same group boxes as the Calculation Page
+            group_box = create_group_box(header, self.fontFamilies['Group_Box'], self.theme)
+            vbox = QVBoxLayout()
+            table = CustomView(self.theme, self.fontFamilies, table_data, column_names, vc_format="NoVC")
+            table.setEditTriggers(QTableView.NoEditTriggers)
+            table.setSelectionMode(QTableView.NoSelection)
+            table.setFocusPolicy(Qt.NoFocus)
+            vbox.addWidget(table)
+            vbox.setAlignment(Qt.AlignTop)
+            vbox.setContentsMargins(10, 30, 10, 10)
+            group_box.setLayout(vbox)
+            layout.addWidget(group_box)
+        return widget
+
+    def export_to_excel(self):
+        """Export the week to one workbook per language, a summary sheet and a sheet per day"""
+        file = self.export_directory()
+        if not file:
+            return
+
+        # Imported here like the other export modules (see export_worker.EXPORT_MODULES)
+        from excel_book import ExcelBook
+        books = []
+        for lang in EXPORT_LANGUAGES:
+            book = ExcelBook(lang, file)
+            for day, page in enumerate(self.pages, 1):
+                book.add_plan(f"Day {day}", page.plan, page.day_start, page.anchors)
+            books.append(book)
+
+        self.start_export(ExportWorker(books, parent=self))
@@ -0,0 +1,107 @@
+import heapq
+from dataclasses import dataclass
+from calculate_times import CalculateTimes, DAY_SECONDS
+
+DAY_MINUTES = DAY_SECONDS // 60
+DEFAULT_DAYS = 7
+
+
+def format_minutes(minutes):
+    # Formats a number of minutes as "H:MM", like the table cells
+    return f"{minutes // 60}:{minutes % 60:02}"
+
+
+@dataclass(frozen=True)
+class WeekPlan:
+    """
+    Result of packing weekly activity targets into days.
+
+    Attributes:
+        days (tuple): ([name, duration] rows with rest, rows without rest) of each day,
+                      the daily activities included in the rows without rest.
+        plans (tuple): PlanResult of each day.
+        unplaced (tuple): (name, minutes, has_rest) sessions that fit in no day.
+        errors (tuple): Messages of the input rows that were skipped.
+    """
+    days: tuple
+    plans: tuple
+    unplaced: tuple = ()
+    errors: tuple = ()
+
+
+def split_sessions(minutes, session):
+    # Near-equal sessions of at most session minutes (extra minutes go to the first ones)
+    count = -(-minutes // session)
+    base, extra = divmod(minutes, count)
+    return [base + 1 if i < extra else base for i in range(count)]
+
+
+def plan_week(weekly_with_rest, weekly_without_rest, daily=(), days=DEFAULT_DAYS, day_cap=DAY_MINUTES,
+              session=None, rules=None):
+    """
+    Distributes weekly activity targets over a number of days.
+
+    Every target is cut into sessions of at most session minutes. The sessions are sorted
+    by their length with rest included, longest first, and each one goes to the day with
+    the most room left, kept on a heap: O(n log days) for n sessions. Taking the emptiest
+    day rather than the first day with room keeps the days balanced, and when the
+    emptiest day is too small no other day can fit the session either.
+
+    Args:
+        weekly_with_rest (list): [name, "H:MM"] weekly targets of activities with rest.
+        weekly_without_rest (list): [name, "H:MM"] weekly targets of activities without rest.
+        daily (list): [name, "H:MM"] activities repeated on every day (no rest).
+        days (int): Number of days.
+        day_cap (int): Minutes available per day, rest and daily activities included.
+        session (int or None): Longest session in minutes (the long task chunk of the rules when None).
+        rules (RestRules or None): Rest policy (Files/rest_rules.dat when None).
+
+    Returns:
+        WeekPlan: Rows and calculated plan of each day.
+    """
+    calc = CalculateTimes([], [], rules)
+    rules = calc.rules
+    session = session or rules.chunk
+    with_rest = calc.convert_list_to_activities(weekly_with_rest)
+    without_rest = calc.convert_list_to_activities(weekly_without_rest)
+    daily_items = calc.convert_list_to_activities(daily)
+    # Fixed start times of daily activities are kept for the timeline
+    daily_rows = [[item.name, format_minutes(item.minutes)] + list(daily[item.index][2:3]) for item in daily_items]
+    errors = tuple(calc.errors)
+
+    # (cost, order, name, minutes, has_rest) of every session
+    sessions = []
+    for order, (item, has_rest) in enumerate([(item, True) for item in with_rest] +
+                                             [(item, False) for item in without_rest]):
+        if item.minutes <= 0:
+            continue
+        for minutes in split_sessions(item.minutes, session):
+            cost = rules.planned_minutes(minutes) if has_rest else minutes
+            sessions.append((cost, order, item.name, minutes, has_rest))
+    sessions.sort(key=lambda s: (-s[0], s[1]))
+
+    # Max-heap of the room left in each day, earliest day first on ties
+    room = day_cap - sum(item.minutes for item in daily_items)
+    heap = [(-room, day) for day in range(days)]
+    placed = [[] for _ in range(days)]
+    unplaced = []
+    for cost, order, name, minutes, has_rest in sessions:
+        free, day = heap[0] if heap else (0, None)
+        if day is None or -free < cost:
+            unplaced.append((name, minutes, has_rest))
+            continue
+        heapq.heapreplace(heap, (free + cost, day))
+        placed[day].append((order, name, minutes, has_rest))
+
+    day_lists = []
+    plans = []
+    for sessions_of_day in placed:
+        # Input order inside a day, like the main window tables
+        sessions_of_day.sort(key=lambda s: s[0])
+        rest_rows = [[name, format_minutes(minutes)] for _, name, minutes, has_rest in sessions_of_day if has_rest]
+        no_rest_rows = [[name, format_minutes(minutes)] for _, name, minutes, has_rest in sessions_of_day if not has_rest]
+        no_rest_rows += [list(row) for row in daily_rows]
+        day_lists.append((rest_rows, no_rest_rows))
+        plans.append(CalculateTimes(rest_rows, no_rest_rows, rules).calculate_plan())
+
+    return WeekPlan(tuple(day_lists), tuple(plans), tuple(unplaced), errors)